@@ -1,33 +1,43 @@
 """Calculation class representing a single calculation."""
 
+import sys
+from dataclasses import dataclass, field
 from datetime import datetime
 from typing import Any
 
 
+@dataclass(frozen=True, slots=True, repr=False)
 class Calculation:
-    """Represents a single calculation with operation, operands, and result."""
+    """
+    Represents a single calculation with operation, operands, and result.
     
-    def __init__(self, operation: str, operand1: float, operand2: float, result: float):
-        """
-        Initialize a calculation.
-        
-        Args:
-            operation: The operation name.
-            operand1: The first operand.
-            operand2: The second operand.
-            result: The result of the calculation.
-        """
-        self.operation = operation
-        self.operand1 = operand1
-        self.operand2 = operand2
-        self.result = result
-        self.timestamp = datetime.now()
+    Instances are immutable, so they can be shared safely between the
+    history and undo/redo snapshots.
+    
+    Attributes:
+        operation: The operation name.
+        operand1: The first operand.
+        operand2: The second operand.
+        result: The result of the calculation.
+        timestamp: When the calculation was performed (defaults to now).
+    """
+    
+    operation: str
+    operand1: float
+    operand2: float
+    result: float
+    timestamp: datetime = field(default_factory=datetime.now)
+    
+    def __post_init__(self):
+        """Intern the operation name so equal names share one string object."""
+        if isinstance(self.operation, str):
+            object.__setattr__(self, 'operation', sys.intern(self.operation))
     
     def __str__(self) -> str:
         """Return string representation of the calculation."""
         return (
             f"{self.operand1} {self.operation} {self.operand2} = {self.result} "
-            f"[{self.timestamp.strftime('%Y-%m-%d %H:%M:%S')}]"
+            f"[{self.timestamp.isoformat(' ', 'seconds')}]"
         )
     
     def __repr__(self) -> str:
@@ -64,15 +74,16 @@ class Calculation:
         Returns:
             A new Calculation instance.
         """
-        calc = cls(
+        # Use the stored timestamp if provided
+        if 'timestamp' in data:
+            timestamp = datetime.fromisoformat(data['timestamp'])
+        else:
+            timestamp = datetime.now()
+        
+        return cls(
             operation=data['operation'],
             operand1=float(data['operand1']),
             operand2=float(data['operand2']),
-            result=float(data['result'])
+            result=float(data['result']),
+            timestamp=timestamp
         )
-        
-        # Set timestamp if provided
-        if 'timestamp' in data:
-            calc.timestamp = datetime.fromisoformat(data['timestamp'])
-        
-        return calc
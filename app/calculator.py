@@ -1,21 +1,139 @@
 """Main calculator module with Observer pattern and REPL interface."""
 
+import atexit
+import csv
+import functools
 import os
+import queue
+import threading
 from abc import ABC, abstractmethod
-from typing import List
-from colorama import init, Fore, Style
+from typing import List, Optional, Tuple
+from colorama import Fore, Style
 
 from app.calculation import Calculation
-from app.operations import OperationFactory
-from app.history import CalculationHistory
+from app.operations import (
+    Operation,
+    OperationFactory,
+    AddOperation,
+    SubtractOperation,
+    MultiplyOperation,
+    DivideOperation,
+    PowerOperation,
+    RootOperation,
+    ModulusOperation,
+    IntegerDivideOperation,
+    PercentageOperation,
+    AbsoluteDifferenceOperation,
+)
+from app.history import CalculationHistory, HISTORY_COLUMNS
 from app.calculator_memento import CalculatorMemento, CalculatorCaretaker
 from app.calculator_config import CalculatorConfig
 from app.logger import Logger
 from app.input_validators import InputValidator
 from app.exceptions import OperationError, ValidationError, HistoryError
 
-# Initialize colorama for cross-platform colored terminal output
-init(autoreset=True)
+# REPL prompts, formatted once rather than on every loop iteration
+PROMPT = f"{Fore.YELLOW}calculator> {Style.RESET_ALL}"
+PROMPT_A = f"{Fore.YELLOW}Enter first number: {Style.RESET_ALL}"
+PROMPT_B = f"{Fore.YELLOW}Enter second number: {Style.RESET_ALL}"
+
+
+@functools.lru_cache(maxsize=None)
+def _build_help_text(operations: Tuple[str, ...]) -> str:
+    """
+    Build the help text for the given operation names.
+    
+    Cached per operation set, so the text is only rebuilt after a new
+    operation is registered.
+    
+    Args:
+        operations: Available operation names.
+        
+    Returns:
+        The formatted help text.
+    """
+    help_text = f"""
+{Fore.CYAN}{Style.BRIGHT}Calculator Commands:
+{Fore.GREEN}Arithmetic Operations:
+"""
+    for op in operations:
+        help_text += f"  {op:<15} - Perform {op} operation\n"
+    
+    help_text += f"""
+{Fore.GREEN}History Management:
+  {"history":<15} - Display calculation history
+  {"clear":<15} - Clear calculation history
+  {"undo":<15} - Undo the last calculation
+  {"redo":<15} - Redo the last undone calculation
+
+{Fore.GREEN}File Operations:
+  {"save":<15} - Save history to CSV file
+  {"load":<15} - Load history from CSV file
+
+{Fore.GREEN}Other Commands:
+  {"help":<15} - Display this help message
+  {"exit":<15} - Exit the calculator
+"""
+    return help_text
+
+
+# Queued to tell the notification worker to exit
+_STOP = object()
+
+
+def _round_result(value: float, precision: int) -> float:
+    """
+    Round a result to the given number of decimal places.
+    
+    Gives exactly the same result as round(). Whole-number floats, which
+    round() returns unchanged, skip the call.
+    
+    Args:
+        value: The value to round.
+        precision: Number of decimal places.
+        
+    Returns:
+        The rounded value.
+    """
+    if isinstance(value, float) and value.is_integer():
+        return value
+    return round(value, precision)
+
+
+# Built-in operations are pure, so their results are safe to memoize;
+# operations added through register_operation may not be
+_PURE_OPERATIONS = frozenset((
+    AddOperation,
+    SubtractOperation,
+    MultiplyOperation,
+    DivideOperation,
+    PowerOperation,
+    RootOperation,
+    ModulusOperation,
+    IntegerDivideOperation,
+    PercentageOperation,
+    AbsoluteDifferenceOperation,
+))
+
+
+@functools.lru_cache(maxsize=1024)
+def _compute(op: Operation, a: float, b: float, precision: int) -> float:
+    """
+    Execute an operation and round the result, memoizing repeated inputs.
+    
+    Only valid for pure operations and nonzero operands. 0.0 and -0.0
+    share a cache key but can give results of different sign.
+    
+    Args:
+        op: Operation to execute.
+        a: First operand.
+        b: Second operand.
+        precision: Number of decimal places to round to.
+        
+    Returns:
+        The rounded result.
+    """
+    return _round_result(op.execute(a, b), precision)
 
 
 class CalculatorObserver(ABC):
@@ -46,15 +164,17 @@ class LoggingObserver(CalculatorObserver):
     
     def on_calculation_performed(self, calculation: Calculation):
         """Log the calculation."""
-        message = (
-            f"Calculation performed: {calculation.operation} "
-            f"({calculation.operand1}, {calculation.operand2}) = {calculation.result}"
+        self.logger.info(
+            "Calculation performed: %s (%s, %s) = %s",
+            calculation.operation,
+            calculation.operand1,
+            calculation.operand2,
+            calculation.result,
         )
-        self.logger.info(message)
 
 
 class AutoSaveObserver(CalculatorObserver):
-    """Observer that automatically saves history to CSV."""
+    """Observer that automatically appends calculations to a CSV file."""
     
     def __init__(self, history: CalculationHistory, file_path: str, encoding: str = 'utf-8'):
         """
@@ -68,13 +188,58 @@ class AutoSaveObserver(CalculatorObserver):
         self.history = history
         self.file_path = file_path
         self.encoding = encoding
+        self._fh = None
+        self._csv_writer = None
+        # Guards the file handle, which is written from the notification
+        # thread and flushed from the main thread
+        self._lock = threading.Lock()
+    
+    def _open(self):
+        """Open the CSV file in append mode, writing a header if it is new."""
+        directory = os.path.dirname(self.file_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        
+        is_new = not os.path.exists(self.file_path) or os.path.getsize(self.file_path) == 0
+        self._fh = open(
+            self.file_path, 'a', buffering=65536, newline='', encoding=self.encoding
+        )
+        self._csv_writer = csv.writer(self._fh)
+        if is_new:
+            self._csv_writer.writerow(HISTORY_COLUMNS)
+        # Flush buffered rows at exit; unregistered again by close()
+        atexit.register(self.close)
     
     def on_calculation_performed(self, calculation: Calculation):
-        """Auto-save history to CSV."""
+        """Append the calculation to the auto-save CSV file."""
         try:
-            self.history.save_to_csv(self.file_path, self.encoding)
+            with self._lock:
+                if self._fh is None:
+                    self._open()
+                self._csv_writer.writerow([
+                    calculation.operation,
+                    calculation.operand1,
+                    calculation.operand2,
+                    calculation.result,
+                    calculation.timestamp.isoformat(),
+                ])
         except Exception as e:
             print(f"{Fore.RED}Failed to auto-save history: {e}")
+    
+    def flush(self):
+        """Flush buffered rows to disk."""
+        with self._lock:
+            if self._fh is not None:
+                self._fh.flush()
+    
+    def close(self):
+        """Flush and close the CSV file."""
+        with self._lock:
+            if self._fh is not None:
+                self._fh.close()
+                self._fh = None
+                self._csv_writer = None
+                atexit.unregister(self.close)
 
 
 class Calculator:
@@ -95,10 +260,16 @@ class Calculator:
         self.logger.configure_file_handler(self.config.log_dir)
         
         self.history = CalculationHistory(self.config.max_history_size)
-        self.caretaker = CalculatorCaretaker()
+        self.caretaker = CalculatorCaretaker(self.config.max_history_size)
         
         # Initialize with empty state for undo/redo
-        self.caretaker.save_state(CalculatorMemento(self.history.get_history()))
+        self.caretaker.save_state(CalculatorMemento(self.history.snapshot()))
+        
+        # Default file used by auto-save and the save/load commands
+        self._default_history_path = os.path.join(
+            self.config.history_dir,
+            'calculator_history.csv'
+        )
         
         # Initialize observers
         self.observers: List[CalculatorObserver] = []
@@ -107,14 +278,29 @@ class Calculator:
         self.register_observer(LoggingObserver(self.logger))
         
         if self.config.auto_save:
-            history_file = os.path.join(
-                self.config.history_dir,
-                'calculator_history.csv'
-            )
             self.register_observer(
-                AutoSaveObserver(self.history, history_file, self.config.default_encoding)
+                AutoSaveObserver(
+                    self.history, self._default_history_path, self.config.default_encoding
+                )
             )
         
+        # Observers run on a background thread so file and log I/O stay
+        # off the calculation path; the thread starts on the first
+        # notification and stops in close()
+        self._notify_queue: queue.Queue = queue.Queue()
+        self._worker: Optional[threading.Thread] = None
+        
+        # REPL commands other than exit and operations
+        self._commands = {
+            'help': self.display_help,
+            'history': self.display_history,
+            'clear': self.clear_history,
+            'undo': self.undo,
+            'redo': self.redo,
+            'save': self.save_history,
+            'load': self.load_history,
+        }
+        
         self.logger.info("Calculator initialized")
     
     def register_observer(self, observer: CalculatorObserver):
@@ -126,15 +312,61 @@ class Calculator:
         """
         self.observers.append(observer)
     
+    def wait_for_observers(self):
+        """Block until all queued observer notifications have been handled."""
+        self._notify_queue.join()
+    
+    def close(self):
+        """Stop the notification thread and close auto-save files."""
+        if self._worker is not None:
+            self._notify_queue.put(_STOP)
+            self._worker.join()
+            self._worker = None
+            atexit.unregister(self.close)
+        for observer in self.observers:
+            if isinstance(observer, AutoSaveObserver):
+                observer.close()
+    
+    def flush_observers(self):
+        """Flush any buffered output held by auto-save observers."""
+        self.wait_for_observers()
+        for observer in self.observers:
+            if isinstance(observer, AutoSaveObserver):
+                observer.flush()
+    
     def notify_observers(self, calculation: Calculation):
         """
-        Notify all observers of a calculation.
+        Queue a calculation for delivery to all observers.
+        
+        Observers are called in registration order on a background thread;
+        use wait_for_observers() to wait until they have run.
         
         Args:
             calculation: The calculation to notify about.
         """
-        for observer in self.observers:
-            observer.on_calculation_performed(calculation)
+        if self._worker is None:
+            self._worker = threading.Thread(target=self._notify_worker, daemon=True)
+            self._worker.start()
+            atexit.register(self.close)
+        self._notify_queue.put(calculation)
+    
+    def _notify_worker(self):
+        """Deliver queued calculations to observers until close() is called."""
+        while True:
+            calculation = self._notify_queue.get()
+            if calculation is _STOP:
+                self._notify_queue.task_done()
+                return
+            try:
+                for observer in tuple(self.observers):
+                    try:
+                        observer.on_calculation_performed(calculation)
+                    except Exception as e:
+                        self.logger.error(
+                            "Observer %s failed: %s", type(observer).__name__, e
+                        )
+            finally:
+                self._notify_queue.task_done()
     
     def perform_calculation(self, operation: str, operand1: float, operand2: float) -> float:
         """
@@ -152,16 +384,21 @@ class Calculator:
             OperationError: If the operation fails.
             ValidationError: If inputs are invalid.
         """
+        # Resolve the config and validator once instead of per operand
+        config = self.config
+        validate = InputValidator.validate_number
+        max_value = config.max_input_value
+        
         # Validate inputs
-        operand1 = InputValidator.validate_number(operand1, self.config.max_input_value)
-        operand2 = InputValidator.validate_number(operand2, self.config.max_input_value)
+        operand1 = validate(operand1, max_value)
+        operand2 = validate(operand2, max_value)
         
-        # Get operation and execute
+        # Get operation, then execute and round to configured precision
         op = OperationFactory.create_operation(operation)
-        result = op.execute(operand1, operand2)
-        
-        # Round result to configured precision
-        result = round(result, self.config.precision)
+        if operand1 and operand2 and type(op) in _PURE_OPERATIONS:
+            result = _compute(op, operand1, operand2, config.precision)
+        else:
+            result = _round_result(op.execute(operand1, operand2), config.precision)
         
         # Create calculation record
         calculation = Calculation(operation, operand1, operand2, result)
@@ -170,7 +407,7 @@ class Calculator:
         self.history.add_calculation(calculation)
         
         # Save state AFTER adding calculation
-        self.caretaker.save_state(CalculatorMemento(self.history.get_history()))
+        self.caretaker.save_state(CalculatorMemento(self.history.snapshot()))
         
         # Notify observers
         self.notify_observers(calculation)
@@ -189,7 +426,7 @@ class Calculator:
         
         try:
             memento = self.caretaker.undo()
-            self.history.set_history(memento.get_history())
+            self.history.restore(memento.get_snapshot())
             self.logger.info("Undo performed")
             print(f"{Fore.GREEN}Undo successful")
         except IndexError:
@@ -207,7 +444,7 @@ class Calculator:
         
         try:
             memento = self.caretaker.redo()
-            self.history.set_history(memento.get_history())
+            self.history.restore(memento.get_snapshot())
             self.logger.info("Redo performed")
             print(f"{Fore.GREEN}Redo successful")
         except IndexError:
@@ -228,13 +465,11 @@ class Calculator:
             file_path: Path to save file (optional).
         """
         if file_path is None:
-            file_path = os.path.join(
-                self.config.history_dir,
-                'calculator_history.csv'
-            )
+            file_path = self._default_history_path
         
+        self.flush_observers()
         self.history.save_to_csv(file_path, self.config.default_encoding)
-        self.logger.info(f"History saved to {file_path}")
+        self.logger.info("History saved to %s", file_path)
         print(f"{Fore.GREEN}History saved to {file_path}")
     
     def load_history(self, file_path: str = None):
@@ -245,13 +480,11 @@ class Calculator:
             file_path: Path to load file (optional).
         """
         if file_path is None:
-            file_path = os.path.join(
-                self.config.history_dir,
-                'calculator_history.csv'
-            )
+            file_path = self._default_history_path
         
+        self.flush_observers()
         self.history.load_from_csv(file_path, self.config.default_encoding)
-        self.logger.info(f"History loaded from {file_path}")
+        self.logger.info("History loaded from %s", file_path)
         print(f"{Fore.GREEN}History loaded from {file_path}")
     
     def display_history(self):
@@ -265,92 +498,47 @@ class Calculator:
     
     def display_help(self):
         """Display help information."""
-        operations = OperationFactory.get_available_operations()
-        
-        help_text = f"""
-{Fore.CYAN}{Style.BRIGHT}Calculator Commands:
-{Fore.GREEN}Arithmetic Operations:
-"""
-        for op in operations:
-            help_text += f"  {op:<15} - Perform {op} operation\n"
-        
-        help_text += f"""
-{Fore.GREEN}History Management:
-  {"history":<15} - Display calculation history
-  {"clear":<15} - Clear calculation history
-  {"undo":<15} - Undo the last calculation
-  {"redo":<15} - Redo the last undone calculation
-
-{Fore.GREEN}File Operations:
-  {"save":<15} - Save history to CSV file
-  {"load":<15} - Load history from CSV file
-
-{Fore.GREEN}Other Commands:
-  {"help":<15} - Display this help message
-  {"exit":<15} - Exit the calculator
-"""
-        print(help_text)
+        print(_build_help_text(tuple(OperationFactory.get_available_operations())))
     
     def run_repl(self):
         """Run the REPL (Read-Eval-Print Loop) interface."""
         print(f"{Fore.CYAN}{Style.BRIGHT}Welcome to the Advanced Calculator!")
         print(f"{Fore.CYAN}Type 'help' for available commands or 'exit' to quit.\n")
         
+        # The operation set doesn't change while the REPL runs; bind the
+        # lookups used on every turn to locals
+        available_operations = frozenset(OperationFactory.get_available_operations())
+        commands = self._commands
+        read = input
+        
         while True:
             try:
-                # Read command
-                command = input(f"{Fore.YELLOW}calculator> {Style.RESET_ALL}").strip().lower()
+                # Read command, lowercasing only when needed
+                command = read(PROMPT).strip()
                 
                 if not command:
                     continue
                 
+                if not command.islower():
+                    command = command.lower()
+                
                 # Handle exit
                 if command == 'exit':
                     print(f"{Fore.CYAN}Goodbye!")
                     self.logger.info("Calculator exited")
                     break
                 
-                # Handle help
-                if command == 'help':
-                    self.display_help()
-                    continue
-                
-                # Handle history
-                if command == 'history':
-                    self.display_history()
-                    continue
-                
-                # Handle clear
-                if command == 'clear':
-                    self.clear_history()
-                    continue
-                
-                # Handle undo
-                if command == 'undo':
-                    self.undo()
-                    continue
-                
-                # Handle redo
-                if command == 'redo':
-                    self.redo()
-                    continue
-                
-                # Handle save
-                if command == 'save':
-                    self.save_history()
-                    continue
-                
-                # Handle load
-                if command == 'load':
-                    self.load_history()
+                # Handle history and file commands
+                handler = commands.get(command)
+                if handler is not None:
+                    handler()
                     continue
                 
                 # Handle operations
-                available_operations = OperationFactory.get_available_operations()
                 if command in available_operations:
                     # Get operands
-                    operand1_str = input(f"{Fore.YELLOW}Enter first number: {Style.RESET_ALL}").strip()
-                    operand2_str = input(f"{Fore.YELLOW}Enter second number: {Style.RESET_ALL}").strip()
+                    operand1_str = read(PROMPT_A).strip()
+                    operand2_str = read(PROMPT_B).strip()
                     
                     # Perform calculation
                     result = self.perform_calculation(command, operand1_str, operand2_str)
@@ -360,19 +548,27 @@ class Calculator:
                 
             except (OperationError, ValidationError, HistoryError) as e:
                 print(f"{Fore.RED}Error: {e}")
-                self.logger.error(str(e))
+                self.logger.error("%s", e)
             except KeyboardInterrupt:
                 print(f"\n{Fore.CYAN}Use 'exit' command to quit.")
             except Exception as e:
                 print(f"{Fore.RED}Unexpected error: {e}")
-                self.logger.error(f"Unexpected error: {e}")
+                self.logger.error("Unexpected error: %s", e)
 
 
 def main():
     """Main entry point for the calculator application."""
+    # Initialize colorama for cross-platform colored terminal output. Done
+    # here rather than at import so library use of Calculator skips it.
+    from colorama import init
+    init(autoreset=True)
+    
     try:
         calculator = Calculator()
-        calculator.run_repl()
+        try:
+            calculator.run_repl()
+        finally:
+            calculator.close()
     except Exception as e:
         print(f"{Fore.RED}Failed to start calculator: {e}")
 
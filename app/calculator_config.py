@@ -1,23 +1,57 @@
 """Configuration management for the calculator application."""
 
 import os
-from typing import Any
-from dotenv import load_dotenv
+from functools import lru_cache
+from typing import Any, Dict, Mapping, Optional
+from dotenv import dotenv_values
 from app.exceptions import ConfigurationError
 
 
+@lru_cache(maxsize=32)
+def _parse_env_file(path: str, mtime_ns: int, size: int) -> Dict[str, Optional[str]]:
+    """
+    Parse a .env file, caching the result per path and file version.
+    
+    mtime_ns and size are only part of the cache key, so an edited file
+    is parsed again. The returned dict is shared and must not be mutated.
+    """
+    return dotenv_values(path)
+
+
+def _load_env_file(path: str):
+    """
+    Copy the values of a .env file into os.environ, overriding existing ones.
+    
+    A missing file is ignored, as load_dotenv does.
+    """
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return
+    values = _parse_env_file(path, stat.st_mtime_ns, stat.st_size)
+    os.environ.update(
+        (key, value) for key, value in values.items() if value is not None
+    )
+
+
+def _parse_bool(value: str) -> bool:
+    """Parse a boolean configuration value; only 'true' (any case) is True."""
+    return value.lower() == 'true'
+
+
 class CalculatorConfig:
     """Manages configuration settings for the calculator."""
     
-    # Default configuration values
+    # Default configuration values and the function used to convert
+    # values read from the environment
     DEFAULTS = {
-        'CALCULATOR_LOG_DIR': 'logs',
-        'CALCULATOR_HISTORY_DIR': 'history',
-        'CALCULATOR_MAX_HISTORY_SIZE': 100,
-        'CALCULATOR_AUTO_SAVE': 'true',
-        'CALCULATOR_PRECISION': 2,
-        'CALCULATOR_MAX_INPUT_VALUE': 1e10,
-        'CALCULATOR_DEFAULT_ENCODING': 'utf-8',
+        'CALCULATOR_LOG_DIR': ('logs', str),
+        'CALCULATOR_HISTORY_DIR': ('history', str),
+        'CALCULATOR_MAX_HISTORY_SIZE': (100, int),
+        'CALCULATOR_AUTO_SAVE': (True, _parse_bool),
+        'CALCULATOR_PRECISION': (2, int),
+        'CALCULATOR_MAX_INPUT_VALUE': (1e10, float),
+        'CALCULATOR_DEFAULT_ENCODING': ('utf-8', str),
     }
     
     def __init__(self, env_file: str = '.env'):
@@ -27,57 +61,80 @@ class CalculatorConfig:
         Args:
             env_file: Path to the .env file.
         """
-        # Load environment variables from .env file
-        # Override=True to prioritize the env file over system environment
-        load_dotenv(env_file, override=True)
+        # Load environment variables from .env file, prioritizing the env
+        # file over the system environment; the parse is cached per file
+        _load_env_file(env_file)
         
         self._config = {}
         self._load_config()
         self._validate_config()
     
-    def _load_config(self):
-        """Load configuration from environment variables with defaults."""
-        for key, default_value in self.DEFAULTS.items():
-            value = os.getenv(key, default_value)
-            self._config[key] = value
+    @classmethod
+    def from_mapping(cls, values: Mapping[str, str]) -> 'CalculatorConfig':
+        """
+        Create a configuration from a mapping instead of the environment.
+        
+        No .env file is read and os.environ is left untouched; keys missing
+        from values fall back to their defaults.
+        
+        Args:
+            values: Raw configuration values keyed by variable name.
+            
+        Returns:
+            A validated configuration instance.
+            
+        Raises:
+            ConfigurationError: If a value is invalid.
+        """
+        config = cls.__new__(cls)
+        config._config = {}
+        config._load_config(values)
+        config._validate_config()
+        return config
     
-    def _validate_config(self):
-        """Validate and convert configuration values to appropriate types."""
+    def _load_config(self, source: Optional[Mapping[str, str]] = None):
+        """
+        Load configuration from environment variables with defaults.
+        
+        Values read from the environment are converted to their typed form
+        in the same pass.
+        
+        Args:
+            source: Mapping to read raw values from (default: os.environ).
+        
+        Raises:
+            ConfigurationError: If a value cannot be converted.
+        """
+        if source is None:
+            source = os.environ
         try:
-            # Convert numeric values
-            self._config['CALCULATOR_MAX_HISTORY_SIZE'] = int(
-                self._config['CALCULATOR_MAX_HISTORY_SIZE']
-            )
-            self._config['CALCULATOR_PRECISION'] = int(
-                self._config['CALCULATOR_PRECISION']
+            for key, (default_value, convert) in self.DEFAULTS.items():
+                raw = source.get(key)
+                self._config[key] = default_value if raw is None else convert(raw)
+        except ValueError as e:
+            raise ConfigurationError(f"Invalid configuration value: {e}")
+    
+    def _validate_config(self):
+        """
+        Validate configuration value ranges.
+        
+        Raises:
+            ConfigurationError: If a value is out of range.
+        """
+        if self._config['CALCULATOR_MAX_HISTORY_SIZE'] < 1:
+            raise ConfigurationError(
+                "CALCULATOR_MAX_HISTORY_SIZE must be at least 1"
             )
-            self._config['CALCULATOR_MAX_INPUT_VALUE'] = float(
-                self._config['CALCULATOR_MAX_INPUT_VALUE']
+        
+        if self._config['CALCULATOR_PRECISION'] < 0:
+            raise ConfigurationError(
+                "CALCULATOR_PRECISION must be non-negative"
             )
-            
-            # Convert boolean value
-            self._config['CALCULATOR_AUTO_SAVE'] = (
-                self._config['CALCULATOR_AUTO_SAVE'].lower() == 'true'
+        
+        if self._config['CALCULATOR_MAX_INPUT_VALUE'] <= 0:
+            raise ConfigurationError(
+                "CALCULATOR_MAX_INPUT_VALUE must be positive"
             )
-            
-            # Validate ranges
-            if self._config['CALCULATOR_MAX_HISTORY_SIZE'] < 1:
-                raise ConfigurationError(
-                    "CALCULATOR_MAX_HISTORY_SIZE must be at least 1"
-                )
-            
-            if self._config['CALCULATOR_PRECISION'] < 0:
-                raise ConfigurationError(
-                    "CALCULATOR_PRECISION must be non-negative"
-                )
-            
-            if self._config['CALCULATOR_MAX_INPUT_VALUE'] <= 0:
-                raise ConfigurationError(
-                    "CALCULATOR_MAX_INPUT_VALUE must be positive"
-                )
-            
-        except (ValueError, AttributeError) as e:
-            raise ConfigurationError(f"Invalid configuration value: {e}")
     
     def get(self, key: str, default: Any = None) -> Any:
         """
@@ -1,39 +1,71 @@
 """Memento pattern implementation for calculator state management."""
 
-from typing import List
+from collections import deque
+from typing import Deque, Optional, Sequence, Tuple, Union
 from app.calculation import Calculation
+from app.history import HistorySnapshot
 
 
 class CalculatorMemento:
     """Stores the state of the calculator for undo/redo functionality."""
     
-    def __init__(self, history: List[Calculation]):
+    def __init__(self, history: Union[HistorySnapshot, Sequence[Calculation]]):
         """
         Initialize memento with calculator history.
         
         Args:
-            history: List of calculations to save.
+            history: History snapshot or calculations to save. A snapshot
+                is stored as-is, sharing its nodes with the history.
         """
-        # Create a deep copy of the history
-        self._history = [calc for calc in history]
+        # Read-only view of the calculations, built on first request
+        self._history: Optional[Tuple[Calculation, ...]] = None
+        
+        if not isinstance(history, HistorySnapshot):
+            self._history = tuple(history)
+            history = HistorySnapshot.from_calculations(self._history)
+        self._snapshot = history
     
-    def get_history(self) -> List[Calculation]:
+    def get_history(self) -> Tuple[Calculation, ...]:
         """
         Get the saved history.
         
+        Calculations are immutable, so the same tuple is shared by every
+        caller instead of being copied on each call.
+        
         Returns:
-            List of calculations.
+            Tuple of calculations.
+        """
+        if self._history is None:
+            self._history = tuple(self._snapshot.to_list())
+        return self._history
+    
+    def get_snapshot(self) -> HistorySnapshot:
         """
-        return [calc for calc in self._history]
+        Get the saved history snapshot.
+        
+        Returns:
+            The history snapshot.
+        """
+        return self._snapshot
 
 
 class CalculatorCaretaker:
     """Manages mementos for undo/redo operations."""
     
-    def __init__(self):
-        """Initialize the caretaker with empty undo and redo stacks."""
-        self._undo_stack: List[CalculatorMemento] = []
-        self._redo_stack: List[CalculatorMemento] = []
+    def __init__(self, max_size: Optional[int] = None):
+        """
+        Initialize the caretaker with empty undo and redo stacks.
+        
+        Args:
+            max_size: Maximum number of states kept on each stack
+                (unbounded if None). The oldest states are dropped first.
+        """
+        self.max_size = max_size
+        self._undo_stack: Deque[CalculatorMemento] = deque(maxlen=max_size)
+        self._redo_stack: Deque[CalculatorMemento] = deque(maxlen=max_size)
+        # Set once a state falls off the undo stack; the oldest kept state
+        # then becomes the floor that undo cannot go past
+        self._evicted = False
     
     def save_state(self, memento: CalculatorMemento):
         """
@@ -42,6 +74,8 @@ class CalculatorCaretaker:
         Args:
             memento: The memento to save.
         """
+        if len(self._undo_stack) == self._undo_stack.maxlen:
+            self._evicted = True
         self._undo_stack.append(memento)
         # Clear redo stack when a new state is saved
         self._redo_stack.clear()
@@ -56,7 +90,7 @@ class CalculatorCaretaker:
         Raises:
             IndexError: If there's nothing to undo.
         """
-        if not self._undo_stack:
+        if not self.can_undo():
             raise IndexError("Nothing to undo")
         
         # Pop the current state and move it to redo stack
@@ -67,7 +101,8 @@ class CalculatorCaretaker:
         if self._undo_stack:
             return self._undo_stack[-1]
         else:
-            # Return an empty state if no more undo history
+            # Return an empty state if no more undo history; only reachable
+            # when no state was ever evicted
             return CalculatorMemento([])
     
     def redo(self) -> CalculatorMemento:
@@ -96,7 +131,7 @@ class CalculatorCaretaker:
         Returns:
             True if undo is possible, False otherwise.
         """
-        return len(self._undo_stack) > 0
+        return len(self._undo_stack) > (1 if self._evicted else 0)
     
     def can_redo(self) -> bool:
         """
@@ -111,3 +146,4 @@ class CalculatorCaretaker:
         """Clear all undo and redo stacks."""
         self._undo_stack.clear()
         self._redo_stack.clear()
+        self._evicted = False
@@ -1,14 +1,76 @@
-"""History management with pandas integration for CSV operations."""
+"""History management with CSV persistence."""
 
+import csv
 import os
-from typing import List
-import pandas as pd
+from collections import deque, namedtuple
+from datetime import datetime
+from typing import Iterable, Iterator, List, NamedTuple, Optional
 from app.calculation import Calculation
 from app.exceptions import HistoryError
 
+# Column order used for history CSV files
+HISTORY_COLUMNS = ['operation', 'operand1', 'operand2', 'result', 'timestamp']
+
+# Characters that force a CSV field to be quoted
+_CSV_SPECIAL_CHARS = (',', '"', '\r', '\n')
+
+# Node of the persistent history chain, linking each calculation to the one before it
+_Node = namedtuple('_Node', 'calc prev')
+
+
+def _link(calculations: Iterable[Calculation]) -> Optional[_Node]:
+    """Build a history chain from calculations in chronological order."""
+    head = None
+    for calc in calculations:
+        head = _Node(calc, head)
+    return head
+
+
+class HistorySnapshot(NamedTuple):
+    """
+    Immutable point-in-time view of a calculation history.
+    
+    Snapshots share their nodes with the history they were taken from,
+    so taking one costs O(1) regardless of the history length. depth
+    counts every node in the chain, including hidden ones past length.
+    """
+    
+    head: Optional[_Node]
+    length: int
+    depth: int
+    
+    @classmethod
+    def from_calculations(cls, calculations: Iterable[Calculation]) -> 'HistorySnapshot':
+        """
+        Create a snapshot from calculations in chronological order.
+        
+        Args:
+            calculations: Calculations to include.
+            
+        Returns:
+            A new snapshot.
+        """
+        calculations = list(calculations)
+        return cls(_link(calculations), len(calculations), len(calculations))
+    
+    def to_list(self) -> List[Calculation]:
+        """
+        Get the calculations in the snapshot.
+        
+        Returns:
+            List of calculations, oldest first.
+        """
+        calculations = []
+        node = self.head
+        for _ in range(self.length):
+            calculations.append(node.calc)
+            node = node.prev
+        calculations.reverse()
+        return calculations
+
 
 class CalculationHistory:
-    """Manages calculation history with file persistence using pandas."""
+    """Manages calculation history with CSV file persistence."""
     
     def __init__(self, max_size: int = 100):
         """
@@ -17,9 +79,18 @@ class CalculationHistory:
         Args:
             max_size: Maximum number of calculations to store.
         """
-        self._history: List[Calculation] = []
+        self._head: Optional[_Node] = None
+        self._length = 0
+        # Number of nodes in the chain, which may run past max_size
+        # until the chain is relinked
+        self._depth = 0
         self._max_size = max_size
     
+    def _relink(self):
+        """Rebuild the chain so it only holds the visible calculations."""
+        self._head = _link(self.get_history())
+        self._depth = self._length
+    
     def add_calculation(self, calculation: Calculation):
         """
         Add a calculation to history.
@@ -27,11 +98,15 @@ class CalculationHistory:
         Args:
             calculation: The calculation to add.
         """
-        self._history.append(calculation)
+        self._head = _Node(calculation, self._head)
+        self._depth += 1
         
-        # Trim history if it exceeds max size
-        if len(self._history) > self._max_size:
-            self._history = self._history[-self._max_size:]
+        # Older calculations beyond max size stay linked but hidden until
+        # the chain is relinked, keeping trimming amortized O(1)
+        if self._length < self._max_size:
+            self._length += 1
+        elif self._depth >= 2 * self._max_size:
+            self._relink()
     
     def get_history(self) -> List[Calculation]:
         """
@@ -40,11 +115,39 @@ class CalculationHistory:
         Returns:
             List of calculations.
         """
-        return self._history.copy()
+        return self.snapshot().to_list()
+    
+    def snapshot(self) -> HistorySnapshot:
+        """
+        Get an immutable snapshot of the history.
+        
+        Returns:
+            Snapshot sharing structure with the current history.
+        """
+        return HistorySnapshot(self._head, self._length, self._depth)
+    
+    def restore(self, snapshot: HistorySnapshot):
+        """
+        Replace current history with a snapshot without copying it.
+        
+        Args:
+            snapshot: Snapshot to restore.
+        """
+        if snapshot.length > self._max_size:
+            self.set_history(snapshot.to_list())
+            return
+        
+        self._head = snapshot.head
+        self._length = snapshot.length
+        self._depth = snapshot.depth
+        if self._depth >= 2 * self._max_size:
+            self._relink()
     
     def clear_history(self):
         """Clear all history."""
-        self._history.clear()
+        self._head = None
+        self._length = 0
+        self._depth = 0
     
     def get_last_calculation(self) -> Calculation:
         """
@@ -56,9 +159,9 @@ class CalculationHistory:
         Raises:
             HistoryError: If history is empty.
         """
-        if not self._history:
+        if not self._length:
             raise HistoryError("History is empty")
-        return self._history[-1]
+        return self._head.calc
     
     def remove_last_calculation(self):
         """
@@ -67,26 +170,31 @@ class CalculationHistory:
         Raises:
             HistoryError: If history is empty.
         """
-        if not self._history:
+        if not self._length:
             raise HistoryError("History is empty")
-        self._history.pop()
+        self._head = self._head.prev
+        self._length -= 1
+        self._depth -= 1
     
-    def set_history(self, history: List[Calculation]):
+    def set_history(self, history: Iterable[Calculation]):
         """
-        Replace current history with a new list.
+        Replace current history with a new sequence of calculations.
         
         Args:
-            history: New history list.
+            history: New history, oldest first. Only the most recent
+                max_size calculations are kept.
         """
-        self._history = history.copy()
+        # A bounded deque trims while consuming, so at most max_size
+        # calculations are held even for long inputs
+        recent = deque(history, maxlen=self._max_size)
         
-        # Trim if necessary
-        if len(self._history) > self._max_size:
-            self._history = self._history[-self._max_size:]
+        self._head = _link(recent)
+        self._length = len(recent)
+        self._depth = self._length
     
     def save_to_csv(self, file_path: str, encoding: str = 'utf-8'):
         """
-        Save history to a CSV file using pandas.
+        Save history to a CSV file.
         
         Args:
             file_path: Path to the CSV file.
@@ -101,24 +209,70 @@ class CalculationHistory:
             if directory:
                 os.makedirs(directory, exist_ok=True)
             
-            # Convert calculations to list of dictionaries
-            data = [calc.to_dict() for calc in self._history]
+            history = self.get_history()
             
-            # Create DataFrame and save to CSV
-            if data:
-                df = pd.DataFrame(data)
-                df.to_csv(file_path, index=False, encoding=encoding)
-            else:
-                # Create empty CSV with headers
-                df = pd.DataFrame(columns=['operation', 'operand1', 'operand2', 'result', 'timestamp'])
-                df.to_csv(file_path, index=False, encoding=encoding)
+            # Numbers and timestamps never need CSV quoting, so only the
+            # operation names decide whether rows can be pre-formatted
+            needs_quoting = any(
+                char in operation
+                for operation in {c.operation for c in history}
+                for char in _CSV_SPECIAL_CHARS
+            )
+            
+            with open(file_path, 'w', newline='', encoding=encoding, buffering=65536) as f:
+                if needs_quoting:
+                    writer = csv.writer(f, lineterminator='\n')
+                    writer.writerow(HISTORY_COLUMNS)
+                    writer.writerows(
+                        (c.operation, c.operand1, c.operand2, c.result,
+                         c.timestamp.isoformat())
+                        for c in history
+                    )
+                else:
+                    f.write(','.join(HISTORY_COLUMNS) + '\n')
+                    f.writelines(
+                        f'{c.operation},{c.operand1},{c.operand2},{c.result},'
+                        f'{c.timestamp.isoformat()}\n'
+                        for c in history
+                    )
                 
         except Exception as e:  # pragma: no cover
             raise HistoryError(f"Failed to save history to CSV: {e}")  # pragma: no cover
     
+    @staticmethod
+    def _parse_rows(header: List[str], rows: Iterable[List[str]]) -> Iterator[Calculation]:
+        """
+        Convert CSV rows to calculations using column positions from the header.
+        
+        Args:
+            header: The CSV header row.
+            rows: Remaining CSV rows.
+            
+        Yields:
+            Calculations in file order.
+            
+        Raises:
+            ValueError: If a required column is missing or a value is invalid.
+        """
+        if not header:
+            return
+        
+        # Look up column positions once instead of building a dict per row
+        op_i, a_i, b_i, r_i = (header.index(column) for column in HISTORY_COLUMNS[:4])
+        ts_i = header.index('timestamp') if 'timestamp' in header else None
+        
+        for row in rows:
+            if ts_i is not None:
+                timestamp = datetime.fromisoformat(row[ts_i])
+            else:
+                timestamp = datetime.now()
+            yield Calculation(
+                row[op_i], float(row[a_i]), float(row[b_i]), float(row[r_i]), timestamp
+            )
+    
     def load_from_csv(self, file_path: str, encoding: str = 'utf-8'):
         """
-        Load history from a CSV file using pandas.
+        Load history from a CSV file.
         
         Args:
             file_path: Path to the CSV file.
@@ -131,36 +285,30 @@ class CalculationHistory:
             if not os.path.exists(file_path):
                 raise HistoryError(f"History file not found: {file_path}")
             
-            # Read CSV using pandas
-            df = pd.read_csv(file_path, encoding=encoding)
-            
-            # Convert DataFrame to list of Calculation objects
-            self._history.clear()
-            for _, row in df.iterrows():
-                calc = Calculation.from_dict(row.to_dict())
-                self._history.append(calc)
+            # Keep only the rows that fit in the history, then convert just
+            # those to Calculation objects; blank lines are skipped, as
+            # DictReader does, and an empty file yields no rows
+            with open(file_path, 'r', newline='', encoding=encoding, buffering=65536) as f:
+                reader = filter(None, csv.reader(f))
+                header = next(reader, [])
+                rows = deque(reader, maxlen=self._max_size)
             
-            # Trim if necessary
-            if len(self._history) > self._max_size:
-                self._history = self._history[-self._max_size:]
+            self.set_history(self._parse_rows(header, rows))
                 
-        except pd.errors.EmptyDataError:
-            # Empty CSV file
-            self._history.clear()
         except Exception as e:
             raise HistoryError(f"Failed to load history from CSV: {e}")
     
     def __len__(self) -> int:
         """Get the number of calculations in history."""
-        return len(self._history)
+        return self._length
     
     def __str__(self) -> str:
         """Return string representation of history."""
-        if not self._history:
+        if not self._length:
             return "No calculations in history"
         
         lines = ["Calculation History:"]
-        for i, calc in enumerate(self._history, 1):
+        for i, calc in enumerate(self.get_history(), 1):
             lines.append(f"{i}. {calc}")
         
         return "\n".join(lines)
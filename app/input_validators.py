@@ -1,5 +1,6 @@
 """Input validation utilities for the calculator application."""
 
+import math
 from typing import Any
 from app.exceptions import ValidationError
 
@@ -27,10 +28,11 @@ class InputValidator:
         except (ValueError, TypeError):
             raise ValidationError(f"Invalid number: {value}")
         
-        if not isinstance(num, (int, float)) or num != num:  # Check for NaN
+        # float() always returns a float, so only NaN needs rejecting here
+        if math.isnan(num):
             raise ValidationError(f"Invalid number: {value}")
         
-        if max_value is not None and abs(num) > max_value:
+        if max_value is not None and (num > max_value or num < -max_value):
             raise ValidationError(
                 f"Number {num} exceeds maximum allowed value of {max_value}"
             )
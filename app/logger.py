@@ -4,9 +4,19 @@ import logging
 import os
 from datetime import datetime
 
+# Formatter shared by all handlers; formatters hold no per-handler state
+_FORMATTER = logging.Formatter(
+    '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+)
+
 
 class Logger:
-    """Manages logging for the calculator application."""
+    """
+    Manages logging for the calculator application.
+    
+    The level methods take %-style args, which are interpolated into the
+    message only if the record is actually emitted.
+    """
     
     _instance = None
     _logger = None
@@ -29,15 +39,10 @@ class Logger:
         
         # Avoid adding handlers multiple times
         if not self._logger.handlers:
-            # Create formatter
-            formatter = logging.Formatter(
-                '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
-            )
-            
             # Console handler
             console_handler = logging.StreamHandler()
             console_handler.setLevel(logging.WARNING)
-            console_handler.setFormatter(formatter)
+            console_handler.setFormatter(_FORMATTER)
             self._logger.addHandler(console_handler)
     
     def configure_file_handler(self, log_dir: str, log_file: str = None):
@@ -53,8 +58,7 @@ class Logger:
         
         # Generate log filename if not provided
         if log_file is None:
-            timestamp = datetime.now().strftime('%Y%m%d')
-            log_file = f'calculator_{timestamp}.log'
+            log_file = f'calculator_{datetime.now():%Y%m%d}.log'
         
         log_path = os.path.join(log_dir, log_file)
         
@@ -64,30 +68,28 @@ class Logger:
                 handler.close()
                 self._logger.removeHandler(handler)
         
-        # Add file handler
-        file_handler = logging.FileHandler(log_path)
+        # Add file handler; delay=True postpones opening the file until
+        # the first record is emitted
+        file_handler = logging.FileHandler(log_path, delay=True)
         file_handler.setLevel(logging.INFO)
-        formatter = logging.Formatter(
-            '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
-        )
-        file_handler.setFormatter(formatter)
+        file_handler.setFormatter(_FORMATTER)
         self._logger.addHandler(file_handler)
     
-    def info(self, message: str):
+    def info(self, message: str, *args, **kwargs):
         """Log an info message."""
-        self._logger.info(message)
+        self._logger.info(message, *args, **kwargs)
     
-    def warning(self, message: str):
+    def warning(self, message: str, *args, **kwargs):
         """Log a warning message."""
-        self._logger.warning(message)
+        self._logger.warning(message, *args, **kwargs)
     
-    def error(self, message: str):
+    def error(self, message: str, *args, **kwargs):
         """Log an error message."""
-        self._logger.error(message)
+        self._logger.error(message, *args, **kwargs)
     
-    def debug(self, message: str):
+    def debug(self, message: str, *args, **kwargs):
         """Log a debug message."""
-        self._logger.debug(message)
+        self._logger.debug(message, *args, **kwargs)
     
     def close_handlers(self):
         """Close all file handlers."""
@@ -1,13 +1,20 @@
 """Operations module with Factory pattern for calculator operations."""
 
+import math
+import operator
+import sys
 from abc import ABC, abstractmethod
-from typing import Dict, Type
+from types import MappingProxyType
+from typing import Dict, List, Mapping, Optional, Type
 from app.exceptions import OperationError
 
 
 class Operation(ABC):
     """Abstract base class for all operations."""
     
+    # Operations are stateless, so instances carry no __dict__
+    __slots__ = ()
+    
     @abstractmethod
     def execute(self, a: float, b: float) -> float:
         """
@@ -28,12 +35,110 @@ class Operation(ABC):
         pass  # pragma: no cover
 
 
+# Arithmetic kernels. Each Operation binds its kernel directly as a static
+# execute method, so a call runs the kernel without an extra Python frame.
+
+def _guard_nonzero(b: float, message: str = "Division by zero is not allowed"):
+    """
+    Raise OperationError if b is zero.
+    
+    Args:
+        b: The operand that must be non-zero.
+        message: Error message to raise with.
+        
+    Raises:
+        OperationError: If b is zero (0.0 and -0.0 are both falsy).
+    """
+    if not b:
+        raise OperationError(message)
+
+
+def _divide(a: float, b: float) -> float:
+    """Divide a by b."""
+    _guard_nonzero(b)
+    return a / b
+
+
+def _power(a: float, b: float) -> float:
+    """Raise a to the power of b."""
+    try:
+        result = a ** b
+        if not isinstance(result, (int, float)) or result != result:  # Check for NaN
+            raise OperationError("Invalid result from power operation")
+        return result
+    except (ValueError, OverflowError) as e:
+        raise OperationError(f"Power operation failed: {e}")
+
+
+def _root(a: float, b: float) -> float:
+    """
+    Calculate the bth root of a.
+    
+    Args:
+        a: The number to find the root of.
+        b: The root degree (e.g., 2 for square root, 3 for cube root).
+    """
+    _guard_nonzero(b, "Root degree cannot be zero")
+    
+    if a < 0 and b % 2 == 0:
+        raise OperationError("Cannot calculate even root of negative number")
+    
+    try:
+        # Square roots use math.sqrt, which is faster than a float power and
+        # correctly rounded. For negative numbers with odd roots, handle the
+        # sign separately.
+        if b == 2:
+            result = math.sqrt(a)
+        elif a < 0:
+            result = -(abs(a) ** (1 / b))
+        else:
+            result = a ** (1 / b)
+        
+        if not isinstance(result, (int, float)) or result != result:  # Check for NaN
+            raise OperationError("Invalid result from root operation")
+        
+        return result
+    except (ValueError, OverflowError, ZeroDivisionError) as e:
+        raise OperationError(f"Root operation failed: {e}")
+
+
+def _modulus(a: float, b: float) -> float:
+    """Calculate a modulo b; the result takes the sign of b, unlike math.fmod."""
+    _guard_nonzero(b, "Modulus by zero is not allowed")
+    return a % b
+
+
+def _int_divide(a: float, b: float) -> float:
+    """Perform integer division of a by b."""
+    _guard_nonzero(b)
+    return a // b
+
+
+def _percent(a: float, b: float) -> float:
+    """
+    Calculate what percentage a is of b.
+    
+    Args:
+        a: The part.
+        b: The whole.
+        
+    Returns:
+        (a / b) * 100
+    """
+    _guard_nonzero(b, "Cannot calculate percentage with zero denominator")
+    return (a / b) * 100
+
+
+def _abs_diff(a: float, b: float) -> float:
+    """Calculate the absolute difference between a and b."""
+    return abs(a - b)
+
+
 class AddOperation(Operation):
     """Addition operation."""
     
-    def execute(self, a: float, b: float) -> float:
-        """Add two numbers."""
-        return a + b
+    __slots__ = ()
+    execute = staticmethod(operator.add)
     
     def get_name(self) -> str:
         """Get operation name."""
@@ -43,9 +148,8 @@ class AddOperation(Operation):
 class SubtractOperation(Operation):
     """Subtraction operation."""
     
-    def execute(self, a: float, b: float) -> float:
-        """Subtract b from a."""
-        return a - b
+    __slots__ = ()
+    execute = staticmethod(operator.sub)
     
     def get_name(self) -> str:
         """Get operation name."""
@@ -55,9 +159,8 @@ class SubtractOperation(Operation):
 class MultiplyOperation(Operation):
     """Multiplication operation."""
     
-    def execute(self, a: float, b: float) -> float:
-        """Multiply two numbers."""
-        return a * b
+    __slots__ = ()
+    execute = staticmethod(operator.mul)
     
     def get_name(self) -> str:
         """Get operation name."""
@@ -67,11 +170,8 @@ class MultiplyOperation(Operation):
 class DivideOperation(Operation):
     """Division operation."""
     
-    def execute(self, a: float, b: float) -> float:
-        """Divide a by b."""
-        if b == 0:
-            raise OperationError("Division by zero is not allowed")
-        return a / b
+    __slots__ = ()
+    execute = staticmethod(_divide)
     
     def get_name(self) -> str:
         """Get operation name."""
@@ -81,15 +181,8 @@ class DivideOperation(Operation):
 class PowerOperation(Operation):
     """Power operation."""
     
-    def execute(self, a: float, b: float) -> float:
-        """Raise a to the power of b."""
-        try:
-            result = a ** b
-            if not isinstance(result, (int, float)) or result != result:  # Check for NaN
-                raise OperationError("Invalid result from power operation")
-            return result
-        except (ValueError, OverflowError) as e:
-            raise OperationError(f"Power operation failed: {e}")
+    __slots__ = ()
+    execute = staticmethod(_power)
     
     def get_name(self) -> str:
         """Get operation name."""
@@ -99,33 +192,8 @@ class PowerOperation(Operation):
 class RootOperation(Operation):
     """Root operation - calculates the nth root of a number."""
     
-    def execute(self, a: float, b: float) -> float:
-        """
-        Calculate the bth root of a.
-        
-        Args:
-            a: The number to find the root of.
-            b: The root degree (e.g., 2 for square root, 3 for cube root).
-        """
-        if b == 0:
-            raise OperationError("Root degree cannot be zero")
-        
-        if a < 0 and b % 2 == 0:
-            raise OperationError("Cannot calculate even root of negative number")
-        
-        try:
-            # For negative numbers with odd roots, handle the sign separately
-            if a < 0:
-                result = -(abs(a) ** (1 / b))
-            else:
-                result = a ** (1 / b)
-            
-            if not isinstance(result, (int, float)) or result != result:  # Check for NaN  # pragma: no cover
-                raise OperationError("Invalid result from root operation")  # pragma: no cover
-            
-            return result
-        except (ValueError, OverflowError, ZeroDivisionError) as e:  # pragma: no cover
-            raise OperationError(f"Root operation failed: {e}")  # pragma: no cover
+    __slots__ = ()
+    execute = staticmethod(_root)
     
     def get_name(self) -> str:
         """Get operation name."""
@@ -135,11 +203,8 @@ class RootOperation(Operation):
 class ModulusOperation(Operation):
     """Modulus operation."""
     
-    def execute(self, a: float, b: float) -> float:
-        """Calculate a modulo b."""
-        if b == 0:
-            raise OperationError("Modulus by zero is not allowed")
-        return a % b
+    __slots__ = ()
+    execute = staticmethod(_modulus)
     
     def get_name(self) -> str:
         """Get operation name."""
@@ -149,11 +214,8 @@ class ModulusOperation(Operation):
 class IntegerDivideOperation(Operation):
     """Integer division operation."""
     
-    def execute(self, a: float, b: float) -> float:
-        """Perform integer division of a by b."""
-        if b == 0:
-            raise OperationError("Division by zero is not allowed")
-        return a // b
+    __slots__ = ()
+    execute = staticmethod(_int_divide)
     
     def get_name(self) -> str:
         """Get operation name."""
@@ -163,20 +225,8 @@ class IntegerDivideOperation(Operation):
 class PercentageOperation(Operation):
     """Percentage operation - calculates what percentage a is of b."""
     
-    def execute(self, a: float, b: float) -> float:
-        """
-        Calculate what percentage a is of b.
-        
-        Args:
-            a: The part.
-            b: The whole.
-            
-        Returns:
-            (a / b) * 100
-        """
-        if b == 0:
-            raise OperationError("Cannot calculate percentage with zero denominator")
-        return (a / b) * 100
+    __slots__ = ()
+    execute = staticmethod(_percent)
     
     def get_name(self) -> str:
         """Get operation name."""
@@ -186,9 +236,8 @@ class PercentageOperation(Operation):
 class AbsoluteDifferenceOperation(Operation):
     """Absolute difference operation."""
     
-    def execute(self, a: float, b: float) -> float:
-        """Calculate the absolute difference between a and b."""
-        return abs(a - b)
+    __slots__ = ()
+    execute = staticmethod(_abs_diff)
     
     def get_name(self) -> str:
         """Get operation name."""
@@ -198,7 +247,8 @@ class AbsoluteDifferenceOperation(Operation):
 class OperationFactory:
     """Factory class for creating operation instances."""
     
-    _operations: Dict[str, Type[Operation]] = {
+    # Mutable registry, only written by register_operation
+    _registry: Dict[str, Type[Operation]] = {
         'add': AddOperation,
         'subtract': SubtractOperation,
         'multiply': MultiplyOperation,
@@ -211,11 +261,39 @@ class OperationFactory:
         'abs_diff': AbsoluteDifferenceOperation,
     }
     
+    # Read-only live view of the registry for everything else
+    _operations: Mapping[str, Type[Operation]] = MappingProxyType(_registry)
+    
+    # Shared instance of each registered operation, by name
+    _instances: Dict[str, Operation] = {}
+    
+    # Operation names as a list and as a comma-joined string, built on
+    # first use and reset whenever the registry changes
+    _available_list: Optional[List[str]] = None
+    _available_str: Optional[str] = None
+    
+    @classmethod
+    def _build_instances(cls):
+        """Create the shared instance of every registered operation."""
+        cls._instances = {
+            name: operation_class()
+            for name, operation_class in cls._operations.items()
+        }
+    
+    @classmethod
+    def _invalidate_caches(cls):
+        """Reset cached operation name lists after the registry changes."""
+        cls._available_list = None
+        cls._available_str = None
+    
     @classmethod
     def create_operation(cls, operation_name: str) -> Operation:
         """
         Create an operation instance by name.
         
+        Operations are stateless, so every lookup of a name returns the
+        same shared instance, built when the operation is registered.
+        
         Args:
             operation_name: Name of the operation.
             
@@ -225,13 +303,13 @@ class OperationFactory:
         Raises:
             OperationError: If the operation is not supported.
         """
-        operation_class = cls._operations.get(operation_name)
-        if operation_class is None:
+        try:
+            return cls._instances[operation_name]
+        except KeyError:
             raise OperationError(
                 f"Unknown operation: {operation_name}. "
-                f"Available operations: {', '.join(cls.get_available_operations())}"
-            )
-        return operation_class()
+                f"Available operations: {cls.get_available_names_joined()}"
+            ) from None
     
     @classmethod
     def get_available_operations(cls) -> list:
@@ -241,7 +319,21 @@ class OperationFactory:
         Returns:
             List of operation names.
         """
-        return list(cls._operations.keys())
+        if cls._available_list is None:
+            cls._available_list = list(cls._operations)
+        return cls._available_list.copy()
+    
+    @classmethod
+    def get_available_names_joined(cls) -> str:
+        """
+        Get the available operation names as a comma-separated string.
+        
+        Returns:
+            Operation names joined with ', '.
+        """
+        if cls._available_str is None:
+            cls._available_str = ', '.join(cls._operations)
+        return cls._available_str
     
     @classmethod
     def register_operation(cls, name: str, operation_class: Type[Operation]):
@@ -251,5 +343,20 @@ class OperationFactory:
         Args:
             name: Name of the operation.
             operation_class: Operation class to register.
+            
+        Raises:
+            OperationError: If the name contains characters that cannot be
+                written to the history CSV unquoted.
         """
-        cls._operations[name] = operation_class
+        if any(char in name for char in ',"\r\n'):
+            raise OperationError(
+                f"Invalid operation name: {name!r}. "
+                "Names cannot contain commas, quotes, or line breaks"
+            )
+        name = sys.intern(name)
+        cls._registry[name] = operation_class
+        cls._instances[name] = operation_class()
+        cls._invalidate_caches()
+
+
+OperationFactory._build_instances()
@@ -6,3 +6,68 @@ import sys
 
 # Add the parent directory to the path so tests can import app modules
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from app.calculation import Calculation
+from app.calculator import Calculator
+from app.calculator_config import CalculatorConfig
+from app.calculator_memento import CalculatorMemento
+from app.history import CalculationHistory
+
+
+@pytest.fixture(scope="session")
+def sample_calcs():
+    """Calculations shared by the tests; Calculation is frozen, so reuse is safe."""
+    return (
+        Calculation("add", 5, 3, 8),
+        Calculation("subtract", 10, 2, 8),
+        Calculation("multiply", 3, 4, 12),
+    )
+
+
+@pytest.fixture
+def empty_history():
+    """Create an empty history with the default max size."""
+    return CalculationHistory()
+
+
+@pytest.fixture
+def two_calc_history(sample_calcs):
+    """Create a history holding the add and subtract sample calculations."""
+    history = CalculationHistory()
+    history.add_calculation(sample_calcs[0])
+    history.add_calculation(sample_calcs[1])
+    return history
+
+
+@pytest.fixture
+def make_calcs():
+    """Return a factory building n 'add' calculations with operands 0..n-1."""
+    def _make_calcs(n):
+        return [Calculation("add", i, i, i*2) for i in range(n)]
+    return _make_calcs
+
+
+@pytest.fixture(scope="class")
+def shared_repl_calc(tmp_path_factory):
+    """Create one calculator shared by the REPL tests of a class."""
+    tmp_path = tmp_path_factory.mktemp("repl")
+    config = CalculatorConfig.from_mapping({
+        'CALCULATOR_LOG_DIR': str(tmp_path / 'logs'),
+        'CALCULATOR_HISTORY_DIR': str(tmp_path / 'history'),
+        'CALCULATOR_AUTO_SAVE': 'false',
+    })
+    calc = Calculator(config)
+    yield calc
+    calc.close()
+    calc.logger.close_handlers()
+
+
+@pytest.fixture
+def calculator_with_config(shared_repl_calc):
+    """Reset the shared calculator to its freshly constructed state."""
+    shared_repl_calc.history.clear_history()
+    shared_repl_calc.caretaker.clear()
+    shared_repl_calc.caretaker.save_state(
+        CalculatorMemento(shared_repl_calc.history.snapshot())
+    )
+    return shared_repl_calc
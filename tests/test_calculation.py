@@ -26,6 +26,11 @@ class TestCalculation:
         assert "8" in string_repr
         assert "add" in string_repr
     
+    def test_calculation_str_timestamp_format(self):
+        """Test string representation shows the timestamp to the second."""
+        calc = Calculation("add", 5, 3, 8, timestamp=datetime(2025, 11, 2, 10, 30, 45, 123456))
+        assert str(calc) == "5 add 3 = 8 [2025-11-02 10:30:45]"
+    
     def test_calculation_repr(self):
         """Test repr of calculation."""
         calc = Calculation("multiply", 2, 4, 8)
@@ -90,3 +95,43 @@ class TestCalculation:
         assert calc.operand1 == 10.5
         assert calc.operand2 == 2.5
         assert calc.result == 4.2
+    
+    def test_calculation_is_immutable(self):
+        """Test calculation fields cannot be reassigned."""
+        from dataclasses import FrozenInstanceError
+        
+        calc = Calculation("add", 5, 3, 8)
+        with pytest.raises(FrozenInstanceError):
+            calc.result = 9
+        assert not hasattr(calc, '__dict__')
+    
+    def test_calculation_equality_is_value_based(self):
+        """Test calculations with the same fields compare equal."""
+        timestamp = datetime(2025, 11, 2, 10, 30, 45)
+        calc1 = Calculation("add", 5, 3, 8, timestamp)
+        calc2 = Calculation("add", 5, 3, 8, timestamp)
+        
+        assert calc1 == calc2
+        assert calc1 is not calc2
+        assert calc1 != Calculation("add", 5, 3, 9, timestamp)
+    
+    def test_calculation_from_dict_preserves_timestamp(self):
+        """Test from_dict restores the stored timestamp."""
+        timestamp = datetime(2025, 11, 2, 10, 30, 45)
+        data = {
+            'operation': 'add',
+            'operand1': 1,
+            'operand2': 2,
+            'result': 3,
+            'timestamp': timestamp.isoformat()
+        }
+        
+        calc = Calculation.from_dict(data)
+        assert calc.timestamp == timestamp
+    
+    def test_calculation_operation_is_interned(self):
+        """Test equal operation names share a single string object."""
+        name = "".join(["mul", "tiply"])
+        calc1 = Calculation(name, 2, 4, 8)
+        calc2 = Calculation("multiply", 3, 3, 9)
+        assert calc1.operation is calc2.operation
@@ -1,14 +1,24 @@
 """Unit tests for calculator module."""
 
 import pytest
+import gc
+import math
 import os
 import tempfile
+import weakref
 from unittest.mock import Mock, patch, MagicMock
-from app.calculator import Calculator, LoggingObserver, AutoSaveObserver
+from app.calculator import (
+    Calculator,
+    LoggingObserver,
+    AutoSaveObserver,
+    _compute,
+    _round_result,
+)
 from app.calculator_config import CalculatorConfig
 from app.calculation import Calculation
 from app.history import CalculationHistory
 from app.logger import Logger
+from app.operations import AddOperation, MultiplyOperation, OperationFactory
 from app.exceptions import OperationError, ValidationError, HistoryError
 
 
@@ -24,26 +34,22 @@ class TestCalculator:
     @pytest.fixture
     def test_config(self, temp_dir):
         """Create a test configuration."""
-        env_content = f"""
-CALCULATOR_LOG_DIR={temp_dir}/logs
-CALCULATOR_HISTORY_DIR={temp_dir}/history
-CALCULATOR_MAX_HISTORY_SIZE=10
-CALCULATOR_AUTO_SAVE=false
-CALCULATOR_PRECISION=2
-CALCULATOR_MAX_INPUT_VALUE=1000000
-CALCULATOR_DEFAULT_ENCODING=utf-8
-"""
-        env_file = os.path.join(temp_dir, '.env')
-        with open(env_file, 'w') as f:
-            f.write(env_content)
-        
-        return CalculatorConfig(env_file)
+        return CalculatorConfig.from_mapping({
+            'CALCULATOR_LOG_DIR': f'{temp_dir}/logs',
+            'CALCULATOR_HISTORY_DIR': f'{temp_dir}/history',
+            'CALCULATOR_MAX_HISTORY_SIZE': '10',
+            'CALCULATOR_AUTO_SAVE': 'false',
+            'CALCULATOR_PRECISION': '2',
+            'CALCULATOR_MAX_INPUT_VALUE': '1000000',
+            'CALCULATOR_DEFAULT_ENCODING': 'utf-8',
+        })
     
     @pytest.fixture
     def calculator(self, test_config):
         """Create a calculator instance for testing."""
         calc = Calculator(test_config)
         yield calc
+        calc.close()
         # Cleanup: close logger file handlers to avoid Windows file locking issues
         calc.logger.close_handlers()
     
@@ -117,6 +123,20 @@ CALCULATOR_DEFAULT_ENCODING=utf-8
         with pytest.raises(HistoryError):
             calculator.undo()
     
+    def test_undo_stops_at_oldest_kept_state(self, calculator):
+        """Test undo past the kept states leaves history intact instead of empty."""
+        # max_history_size is 10, so the oldest undo states get dropped
+        for i in range(12):
+            calculator.perform_calculation("add", i, 1)
+        
+        for _ in range(9):
+            calculator.undo()
+        assert len(calculator.history) == 3
+        
+        with pytest.raises(HistoryError):
+            calculator.undo()
+        assert len(calculator.history) == 3
+    
     def test_redo_operation(self, calculator):
         """Test redo functionality."""
         calculator.perform_calculation("add", 5, 3)
@@ -191,7 +211,48 @@ CALCULATOR_DEFAULT_ENCODING=utf-8
         calculator.register_observer(mock_observer)
         
         calculator.perform_calculation("add", 5, 3)
+        calculator.wait_for_observers()
+        assert mock_observer.on_calculation_performed.called
+    
+    def test_failing_observer_does_not_stop_others(self, calculator):
+        """Test an observer error is logged and later observers still run."""
+        failing_observer = Mock()
+        failing_observer.on_calculation_performed.side_effect = RuntimeError("boom")
+        mock_observer = Mock()
+        calculator.register_observer(failing_observer)
+        calculator.register_observer(mock_observer)
+        
+        with patch.object(calculator.logger, 'error') as mock_error:
+            assert calculator.perform_calculation("add", 5, 3) == 8
+            calculator.wait_for_observers()
+        
+        assert mock_observer.on_calculation_performed.called
+        message, *args = mock_error.call_args[0]
+        assert "boom" in message % tuple(args)
+    
+    def test_notification_thread_starts_lazily(self, calculator):
+        """Test no notification thread runs until a calculation is performed."""
+        assert calculator._worker is None
+        calculator.perform_calculation("add", 5, 3)
+        assert calculator._worker.is_alive()
+    
+    def test_close_stops_notification_thread(self, test_config):
+        """Test close() delivers pending notifications and the thread exits."""
+        calc = Calculator(test_config)
+        mock_observer = Mock()
+        calc.register_observer(mock_observer)
+        calc.perform_calculation("add", 5, 3)
+        worker = calc._worker
+        
+        calc.close()
         assert mock_observer.on_calculation_performed.called
+        assert not worker.is_alive()
+        
+        # Nothing, including atexit, keeps the closed calculator alive
+        ref = weakref.ref(calc)
+        del calc, mock_observer
+        gc.collect()
+        assert ref() is None
     
     def test_precision_rounding(self, calculator):
         """Test result is rounded to configured precision."""
@@ -199,6 +260,72 @@ CALCULATOR_DEFAULT_ENCODING=utf-8
         # With precision=2, should be 3.33
         assert result == 3.33
     
+    @pytest.mark.parametrize("value,precision", [
+        (3.3333333, 2),
+        (0.125, 2),
+        (-0.125, 2),
+        (2.5, 0),
+        (2.675, 2),
+        (7.0, 3),
+        (-0.0, 2),
+        (1e20 + 0.126, 2),
+        (0.1, 400),
+        (float('inf'), 2),
+    ])
+    def test_round_result(self, value, precision):
+        """Test results are rounded exactly as round() rounds them."""
+        result = _round_result(value, precision)
+        expected = round(value, precision)
+        assert result == expected
+        assert math.copysign(1, result) == math.copysign(1, expected)
+    
+    def test_large_precision(self, temp_dir):
+        """Test a precision beyond the float exponent range still calculates."""
+        config = CalculatorConfig.from_mapping({
+            'CALCULATOR_LOG_DIR': f'{temp_dir}/logs',
+            'CALCULATOR_HISTORY_DIR': f'{temp_dir}/history',
+            'CALCULATOR_AUTO_SAVE': 'false',
+            'CALCULATOR_PRECISION': '400',
+        })
+        calc = Calculator(config)
+        try:
+            assert calc.perform_calculation("divide", 10, 3) == round(10 / 3, 400)
+        finally:
+            calc.close()
+            calc.logger.close_handlers()
+    
+    def test_repeated_calculation_is_memoized(self, calculator):
+        """Test identical calculations reuse the cached result."""
+        _compute.cache_clear()
+        with patch.object(MultiplyOperation, 'execute', return_value=42.0) as mock_execute:
+            assert calculator.perform_calculation("multiply", 6, 7) == 42.0
+            assert calculator.perform_calculation("multiply", 6, 7) == 42.0
+        _compute.cache_clear()
+        
+        mock_execute.assert_called_once()
+        # Each call is still recorded in history
+        assert len(calculator.history) == 2
+    
+    def test_signed_zero_not_shared_through_cache(self, calculator):
+        """Test -0.0 and 0.0 operands keep their own result sign."""
+        assert math.copysign(1, calculator.perform_calculation("multiply", "0", "5")) == 1
+        assert math.copysign(1, calculator.perform_calculation("multiply", "-0", "5")) == -1
+    
+    def test_registered_operation_is_not_memoized(self, calculator, monkeypatch):
+        """Test operations added through the factory are executed every time."""
+        
+        class CountingOperation(AddOperation):
+            calls = 0
+            
+            def execute(self, a, b):
+                CountingOperation.calls += 1
+                return a + b
+        
+        monkeypatch.setitem(OperationFactory._instances, "add", CountingOperation())
+        calculator.perform_calculation("add", 6, 7)
+        calculator.perform_calculation("add", 6, 7)
+        assert CountingOperation.calls == 2
+    
     def test_root_operation(self, calculator):
         """Test root operation."""
         result = calculator.perform_calculation("root", 9, 2)
@@ -217,11 +344,10 @@ class TestLoggingObserver:
         observer.on_calculation_performed(calc)
         
         assert mock_logger.info.called
-        call_args = mock_logger.info.call_args[0][0]
-        assert "add" in call_args
-        assert "5" in call_args
-        assert "3" in call_args
-        assert "8" in call_args
+        message, *args = mock_logger.info.call_args[0]
+        assert "Calculation performed" in message
+        assert args == ["add", 5, 3, 8]
+        assert message % tuple(args) == "Calculation performed: add (5, 3) = 8"
 
 
 class TestAutoSaveObserver:
@@ -237,8 +363,46 @@ class TestAutoSaveObserver:
         calc = Calculation("add", 5, 3, 8)
         history.add_calculation(calc)
         observer.on_calculation_performed(calc)
+        observer.flush()
         
         assert file_path.exists()
+        observer.close()
+    
+    def test_auto_save_observer_appends_rows(self, tmp_path):
+        """Test auto-save observer appends one row per calculation."""
+        history = CalculationHistory()
+        file_path = tmp_path / "auto_save.csv"
+        observer = AutoSaveObserver(history, str(file_path))
+        
+        observer.on_calculation_performed(Calculation("add", 5, 3, 8))
+        observer.on_calculation_performed(Calculation("multiply", 4, 2, 8))
+        observer.close()
+        
+        lines = file_path.read_text().splitlines()
+        assert lines[0] == "operation,operand1,operand2,result,timestamp"
+        assert len(lines) == 3
+        assert lines[1].startswith("add,5,3,8,")
+        assert lines[2].startswith("multiply,4,2,8,")
+        
+        # Reopening an existing file should not write a second header
+        observer = AutoSaveObserver(history, str(file_path))
+        observer.on_calculation_performed(Calculation("subtract", 10, 2, 8))
+        observer.close()
+        
+        lines = file_path.read_text().splitlines()
+        assert len(lines) == 4
+        assert lines[3].startswith("subtract,10,2,8,")
+    
+    def test_auto_save_observer_released_after_close(self, tmp_path):
+        """Test a closed auto-save observer is not kept alive by atexit."""
+        observer = AutoSaveObserver(CalculationHistory(), str(tmp_path / "auto_save.csv"))
+        observer.on_calculation_performed(Calculation("add", 5, 3, 8))
+        observer.close()
+        
+        ref = weakref.ref(observer)
+        del observer
+        gc.collect()
+        assert ref() is None
     
     def test_auto_save_observer_error_handling(self, capsys):
         """Test auto-save observer handles errors gracefully."""
@@ -247,8 +411,8 @@ class TestAutoSaveObserver:
         history = CalculationHistory()
         observer = AutoSaveObserver(history, "/tmp/test.csv")
         
-        # Mock save_to_csv to raise an exception
-        with patch.object(history, 'save_to_csv', side_effect=Exception("Test error")):
+        # Mock open to raise an exception
+        with patch('builtins.open', side_effect=OSError("Test error")):
             calc = Calculation("add", 5, 3, 8)
             # Should not raise exception - errors should be caught
             observer.on_calculation_performed(calc)
@@ -261,20 +425,6 @@ class TestAutoSaveObserver:
 class TestCalculatorREPL:
     """Tests for Calculator REPL."""
     
-    @pytest.fixture
-    def calculator_with_config(self, tmp_path):
-        """Create calculator with temporary config."""
-        env_content = f"""
-CALCULATOR_LOG_DIR={tmp_path}/logs
-CALCULATOR_HISTORY_DIR={tmp_path}/history
-CALCULATOR_AUTO_SAVE=false
-"""
-        env_file = tmp_path / '.env'
-        env_file.write_text(env_content)
-        
-        config = CalculatorConfig(str(env_file))
-        return Calculator(config)
-    
     @patch('builtins.input')
     def test_repl_exit_command(self, mock_input, calculator_with_config, capsys):
         """Test REPL exit command."""
@@ -302,6 +452,16 @@ CALCULATOR_AUTO_SAVE=false
         captured = capsys.readouterr()
         assert "Result: 8" in captured.out
     
+    @patch('builtins.input')
+    def test_repl_mixed_case_command(self, mock_input, calculator_with_config, capsys):
+        """Test REPL commands are case-insensitive."""
+        mock_input.side_effect = ['  ADD ', '5', '3', 'Exit']
+        
+        calculator_with_config.run_repl()
+        captured = capsys.readouterr()
+        assert "Result: 8" in captured.out
+        assert "Goodbye" in captured.out
+    
     @patch('builtins.input')
     def test_repl_invalid_command(self, mock_input, calculator_with_config, capsys):
         """Test REPL with invalid command."""
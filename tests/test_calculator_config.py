@@ -2,36 +2,53 @@
 
 import pytest
 import os
-import tempfile
-from app.calculator_config import CalculatorConfig
+from contextlib import contextmanager
+from app.calculator_config import CalculatorConfig, _parse_env_file
 from app.exceptions import ConfigurationError
 
 
+@contextmanager
+def preserved_environ():
+    """
+    Restore os.environ on exit.
+    
+    Loading a .env file copies its values into os.environ; without this
+    they would leak into later tests, e.g. sending their logs and history
+    to the relative test_logs/test_history directories.
+    """
+    saved = os.environ.copy()
+    try:
+        yield
+    finally:
+        os.environ.clear()
+        os.environ.update(saved)
+
+
 class TestCalculatorConfig:
     """Tests for CalculatorConfig class."""
     
-    @pytest.fixture
-    def temp_env_file(self):
-        """Create a temporary .env file."""
-        with tempfile.NamedTemporaryFile(mode='w', suffix='.env', delete=False) as f:
-            f.write("""CALCULATOR_LOG_DIR=test_logs
+    @pytest.fixture(scope="session")
+    def temp_env_file(self, tmp_path_factory):
+        """Create a temporary .env file, shared by the whole test session."""
+        env_file = tmp_path_factory.mktemp("cfg") / "test.env"
+        env_file.write_text("""CALCULATOR_LOG_DIR=test_logs
 CALCULATOR_HISTORY_DIR=test_history
 CALCULATOR_MAX_HISTORY_SIZE=50
 CALCULATOR_AUTO_SAVE=true
 CALCULATOR_PRECISION=3
 CALCULATOR_MAX_INPUT_VALUE=5000
 CALCULATOR_DEFAULT_ENCODING=utf-8""")
-            temp_file = f.name
-        
-        yield temp_file
-        
-        # Cleanup
-        if os.path.exists(temp_file):
-            os.remove(temp_file)
+        return str(env_file)
+    
+    @pytest.fixture(scope="session")
+    def config_from_env_file(self, temp_env_file):
+        """Load the temporary .env file once; the config is read-only."""
+        with preserved_environ():
+            return CalculatorConfig(temp_env_file)
     
-    def test_config_load_from_env(self, temp_env_file):
+    def test_config_load_from_env(self, config_from_env_file):
         """Test loading configuration from .env file."""
-        config = CalculatorConfig(temp_env_file)
+        config = config_from_env_file
         
         assert config.log_dir == 'test_logs'
         assert config.history_dir == 'test_history'
@@ -41,119 +58,75 @@ CALCULATOR_DEFAULT_ENCODING=utf-8""")
         assert config.max_input_value == 5000
         assert config.default_encoding == 'utf-8'
     
-    def test_config_defaults(self):
+    def test_config_defaults(self, monkeypatch):
         """Test configuration uses defaults when env file missing."""
-        # Clear environment vars
-        env_backup = {}
-        for key in ['CALCULATOR_LOG_DIR', 'CALCULATOR_HISTORY_DIR', 'CALCULATOR_MAX_HISTORY_SIZE',
-                    'CALCULATOR_AUTO_SAVE', 'CALCULATOR_PRECISION', 'CALCULATOR_MAX_INPUT_VALUE',
-                    'CALCULATOR_DEFAULT_ENCODING']:
-            if key in os.environ:
-                env_backup[key] = os.environ[key]
-                del os.environ[key]
+        # Clear environment vars for this test only
+        for key in CalculatorConfig.DEFAULTS:
+            monkeypatch.delenv(key, raising=False)
+        
+        config = CalculatorConfig('nonexistent.env')
         
-        try:
-            config = CalculatorConfig('nonexistent.env')
+        assert config.log_dir == 'logs'
+        assert config.history_dir == 'history'
+        assert config.max_history_size == 100
+        assert config.auto_save is True
+        assert config.precision == 2
+        assert config.max_input_value == 1e10
+        assert config.default_encoding == 'utf-8'
+    
+    def test_config_env_file_parsed_once(self, tmp_path):
+        """Test an unchanged .env file is parsed once and reapplied each time."""
+        env_file = tmp_path / 'cached.env'
+        env_file.write_text("CALCULATOR_PRECISION=5\n")
+        _parse_env_file.cache_clear()
+        
+        with preserved_environ():
+            assert CalculatorConfig(str(env_file)).precision == 5
+            os.environ['CALCULATOR_PRECISION'] = '1'
+            assert CalculatorConfig(str(env_file)).precision == 5
+        assert _parse_env_file.cache_info().misses == 1
+    
+    def test_config_env_file_reparsed_after_edit(self, tmp_path):
+        """Test editing a .env file invalidates the cached parse."""
+        env_file = tmp_path / 'edited.env'
+        env_file.write_text("CALCULATOR_PRECISION=5\n")
+        with preserved_environ():
+            assert CalculatorConfig(str(env_file)).precision == 5
             
-            assert config.log_dir == 'logs'
-            assert config.history_dir == 'history'
-            assert config.max_history_size == 100
-            assert config.auto_save is True
-            assert config.precision == 2
-            assert config.max_input_value == 1e10
-            assert config.default_encoding == 'utf-8'
-        finally:
-            # Restore environment
-            for key, value in env_backup.items():
-                os.environ[key] = value
+            env_file.write_text("CALCULATOR_PRECISION=64\n")
+            assert CalculatorConfig(str(env_file)).precision == 64
     
-    def test_config_get_method(self, temp_env_file):
+    def test_config_get_method(self, config_from_env_file):
         """Test get method."""
-        config = CalculatorConfig(temp_env_file)
+        config = config_from_env_file
         
         assert config.get('CALCULATOR_LOG_DIR') == 'test_logs'
         assert config.get('NONEXISTENT_KEY', 'default') == 'default'
     
-    def test_config_invalid_history_size(self):
-        """Test invalid history size raises error."""
-        with tempfile.NamedTemporaryFile(mode='w', suffix='.env', delete=False) as f:
-            f.write("CALCULATOR_MAX_HISTORY_SIZE=0\n")
-            temp_file = f.name
+    def test_config_from_mapping(self):
+        """Test building a configuration from a mapping leaves os.environ alone."""
+        config = CalculatorConfig.from_mapping({
+            'CALCULATOR_LOG_DIR': 'mapped_logs',
+            'CALCULATOR_PRECISION': '4',
+        })
         
-        try:
-            with pytest.raises(ConfigurationError, match="must be at least 1"):
-                CalculatorConfig(temp_file)
-        finally:
-            os.remove(temp_file)
+        assert config.log_dir == 'mapped_logs'
+        assert config.precision == 4
+        assert config.max_history_size == 100
+        assert os.environ.get('CALCULATOR_LOG_DIR') != 'mapped_logs'
     
-    def test_config_invalid_precision(self):
-        """Test invalid precision raises error."""
-        with tempfile.NamedTemporaryFile(mode='w', suffix='.env', delete=False) as f:
-            f.write("""CALCULATOR_LOG_DIR=logs
-CALCULATOR_HISTORY_DIR=history
-CALCULATOR_MAX_HISTORY_SIZE=100
-CALCULATOR_AUTO_SAVE=true
-CALCULATOR_PRECISION=-1
-CALCULATOR_MAX_INPUT_VALUE=10000000000
-CALCULATOR_DEFAULT_ENCODING=utf-8""")
-            temp_file = f.name
-        
-        try:
-            with pytest.raises(ConfigurationError, match="must be non-negative"):
-                CalculatorConfig(temp_file)
-        finally:
-            os.remove(temp_file)
-    
-    def test_config_invalid_max_input_value(self):
-        """Test invalid max input value raises error."""
-        with tempfile.NamedTemporaryFile(mode='w', suffix='.env', delete=False) as f:
-            f.write("""CALCULATOR_LOG_DIR=logs
-CALCULATOR_HISTORY_DIR=history
-CALCULATOR_MAX_HISTORY_SIZE=100
-CALCULATOR_AUTO_SAVE=true
-CALCULATOR_PRECISION=2
-CALCULATOR_MAX_INPUT_VALUE=-100
-CALCULATOR_DEFAULT_ENCODING=utf-8""")
-            temp_file = f.name
-        
-        try:
-            with pytest.raises(ConfigurationError, match="must be positive"):
-                CalculatorConfig(temp_file)
-        finally:
-            os.remove(temp_file)
+    @pytest.mark.parametrize("field,value,match", [
+        ('CALCULATOR_MAX_HISTORY_SIZE', '0', "must be at least 1"),
+        ('CALCULATOR_PRECISION', '-1', "must be non-negative"),
+        ('CALCULATOR_MAX_INPUT_VALUE', '-100', "must be positive"),
+        ('CALCULATOR_MAX_HISTORY_SIZE', 'abc', "Invalid configuration value"),
+    ])
+    def test_config_invalid_value(self, field, value, match):
+        """Test an invalid configuration value raises error."""
+        with pytest.raises(ConfigurationError, match=match):
+            CalculatorConfig.from_mapping({field: value})
     
     def test_config_auto_save_false(self):
         """Test auto_save set to false."""
-        with tempfile.NamedTemporaryFile(mode='w', suffix='.env', delete=False) as f:
-            f.write("""CALCULATOR_LOG_DIR=logs
-CALCULATOR_HISTORY_DIR=history
-CALCULATOR_MAX_HISTORY_SIZE=100
-CALCULATOR_AUTO_SAVE=false
-CALCULATOR_PRECISION=2
-CALCULATOR_MAX_INPUT_VALUE=10000000000
-CALCULATOR_DEFAULT_ENCODING=utf-8""")
-            temp_file = f.name
-        
-        try:
-            config = CalculatorConfig(temp_file)
-            assert config.auto_save is False
-        finally:
-            os.remove(temp_file)
-    
-    def test_config_invalid_type(self):
-        """Test invalid type in config raises error."""
-        with tempfile.NamedTemporaryFile(mode='w', suffix='.env', delete=False) as f:
-            f.write("""CALCULATOR_LOG_DIR=logs
-CALCULATOR_HISTORY_DIR=history
-CALCULATOR_MAX_HISTORY_SIZE=abc
-CALCULATOR_AUTO_SAVE=true
-CALCULATOR_PRECISION=2
-CALCULATOR_MAX_INPUT_VALUE=10000000000
-CALCULATOR_DEFAULT_ENCODING=utf-8""")
-            temp_file = f.name
-        
-        try:
-            with pytest.raises(ConfigurationError, match="Invalid configuration value"):
-                CalculatorConfig(temp_file)
-        finally:
-            os.remove(temp_file)
+        config = CalculatorConfig.from_mapping({'CALCULATOR_AUTO_SAVE': 'false'})
+        assert config.auto_save is False
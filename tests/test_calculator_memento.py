@@ -1,17 +1,19 @@
 """Unit tests for calculator memento pattern."""
 
 import pytest
+from collections import deque
 from app.calculator_memento import CalculatorMemento, CalculatorCaretaker
 from app.calculation import Calculation
+from app.history import CalculationHistory
 
 
 class TestCalculatorMemento:
     """Tests for CalculatorMemento class."""
     
-    def test_memento_creation(self):
+    def test_memento_creation(self, sample_calcs):
         """Test creating a memento."""
-        calc1 = Calculation("add", 5, 3, 8)
-        calc2 = Calculation("subtract", 10, 2, 8)
+        calc1 = sample_calcs[0]
+        calc2 = sample_calcs[1]
         history = [calc1, calc2]
         
         memento = CalculatorMemento(history)
@@ -21,9 +23,9 @@ class TestCalculatorMemento:
         assert saved_history[0] == calc1
         assert saved_history[1] == calc2
     
-    def test_memento_creates_copy(self):
+    def test_memento_creates_copy(self, sample_calcs):
         """Test memento creates a copy of history."""
-        calc = Calculation("add", 5, 3, 8)
+        calc = sample_calcs[0]
         history = [calc]
         
         memento = CalculatorMemento(history)
@@ -35,6 +37,35 @@ class TestCalculatorMemento:
         saved_history = memento.get_history()
         assert len(saved_history) == 1
     
+    def test_memento_does_not_deepcopy(self, sample_calcs):
+        """Test memento keeps the original calculation objects."""
+        original = list(sample_calcs[:2])
+        
+        memento = CalculatorMemento(original)
+        
+        assert memento.get_history()[0] is original[0]
+        assert memento.get_history()[1] is original[1]
+    
+    def test_memento_shares_history_snapshot(self, sample_calcs):
+        """Test memento stores a history snapshot without copying it."""
+        history = CalculationHistory()
+        calc = sample_calcs[0]
+        history.add_calculation(calc)
+        
+        snapshot = history.snapshot()
+        memento = CalculatorMemento(snapshot)
+        
+        assert memento.get_snapshot() is snapshot
+        assert memento.get_history() == (calc,)
+    
+    def test_memento_history_is_shared_read_only_view(self, sample_calcs):
+        """Test get_history returns the same immutable tuple on each call."""
+        memento = CalculatorMemento([sample_calcs[0]])
+        
+        saved_history = memento.get_history()
+        assert isinstance(saved_history, tuple)
+        assert memento.get_history() is saved_history
+    
     def test_memento_empty_history(self):
         """Test memento with empty history."""
         memento = CalculatorMemento([])
@@ -50,26 +81,53 @@ class TestCalculatorCaretaker:
         assert caretaker.can_undo() is False
         assert caretaker.can_redo() is False
     
-    def test_save_state(self):
+    def test_save_state(self, sample_calcs):
         """Test saving state."""
         caretaker = CalculatorCaretaker()
-        calc = Calculation("add", 5, 3, 8)
+        calc = sample_calcs[0]
         memento = CalculatorMemento([calc])
         
         caretaker.save_state(memento)
         assert caretaker.can_undo() is True
     
-    def test_undo(self):
+    def test_max_size_drops_oldest_state(self, make_calcs):
+        """Test the oldest kept state is a floor once older states are dropped."""
+        caretaker = CalculatorCaretaker(max_size=3)
+        calcs = make_calcs(5)
+        for i in range(5):
+            caretaker.save_state(CalculatorMemento(calcs[:i+1]))
+        
+        # Only the three most recent states remain; undo stops at the oldest
+        assert caretaker.undo().get_history() == tuple(calcs[:4])
+        assert caretaker.undo().get_history() == tuple(calcs[:3])
+        assert caretaker.can_undo() is False
+        with pytest.raises(IndexError, match="Nothing to undo"):
+            caretaker.undo()
+        
+        # Redo still walks forward from the floor
+        assert caretaker.redo().get_history() == tuple(calcs[:4])
+    
+    def test_clear_resets_undo_floor(self, sample_calcs):
+        """Test clearing lets undo return to the empty state again."""
+        caretaker = CalculatorCaretaker(max_size=1)
+        caretaker.save_state(CalculatorMemento([sample_calcs[0]]))
+        caretaker.save_state(CalculatorMemento(sample_calcs[:2]))
+        caretaker.clear()
+        
+        caretaker.save_state(CalculatorMemento([sample_calcs[0]]))
+        assert caretaker.undo().get_history() == ()
+    
+    def test_undo(self, sample_calcs):
         """Test undo operation."""
         caretaker = CalculatorCaretaker()
         
         # Save first state
-        calc1 = Calculation("add", 5, 3, 8)
+        calc1 = sample_calcs[0]
         memento1 = CalculatorMemento([calc1])
         caretaker.save_state(memento1)
         
         # Save second state
-        calc2 = Calculation("subtract", 10, 2, 8)
+        calc2 = sample_calcs[1]
         memento2 = CalculatorMemento([calc1, calc2])
         caretaker.save_state(memento2)
         
@@ -85,11 +143,11 @@ class TestCalculatorCaretaker:
         with pytest.raises(IndexError, match="Nothing to undo"):
             caretaker.undo()
     
-    def test_undo_to_empty_state(self):
+    def test_undo_to_empty_state(self, sample_calcs):
         """Test undo to empty initial state."""
         caretaker = CalculatorCaretaker()
         
-        calc = Calculation("add", 5, 3, 8)
+        calc = sample_calcs[0]
         memento = CalculatorMemento([calc])
         caretaker.save_state(memento)
         
@@ -97,15 +155,15 @@ class TestCalculatorCaretaker:
         previous = caretaker.undo()
         assert len(previous.get_history()) == 0
     
-    def test_redo(self):
+    def test_redo(self, sample_calcs):
         """Test redo operation."""
         caretaker = CalculatorCaretaker()
         
-        calc1 = Calculation("add", 5, 3, 8)
+        calc1 = sample_calcs[0]
         memento1 = CalculatorMemento([calc1])
         caretaker.save_state(memento1)
         
-        calc2 = Calculation("subtract", 10, 2, 8)
+        calc2 = sample_calcs[1]
         memento2 = CalculatorMemento([calc1, calc2])
         caretaker.save_state(memento2)
         
@@ -122,15 +180,15 @@ class TestCalculatorCaretaker:
         with pytest.raises(IndexError, match="Nothing to redo"):
             caretaker.redo()
     
-    def test_save_clears_redo_stack(self):
+    def test_save_clears_redo_stack(self, sample_calcs):
         """Test saving new state clears redo stack."""
         caretaker = CalculatorCaretaker()
         
-        calc1 = Calculation("add", 5, 3, 8)
+        calc1 = sample_calcs[0]
         memento1 = CalculatorMemento([calc1])
         caretaker.save_state(memento1)
         
-        calc2 = Calculation("subtract", 10, 2, 8)
+        calc2 = sample_calcs[1]
         memento2 = CalculatorMemento([calc1, calc2])
         caretaker.save_state(memento2)
         
@@ -139,37 +197,37 @@ class TestCalculatorCaretaker:
         assert caretaker.can_redo() is True
         
         # Save new state should clear redo
-        calc3 = Calculation("multiply", 3, 4, 12)
+        calc3 = sample_calcs[2]
         memento3 = CalculatorMemento([calc1, calc3])
         caretaker.save_state(memento3)
         
         assert caretaker.can_redo() is False
     
-    def test_can_undo(self):
+    def test_can_undo(self, sample_calcs):
         """Test can_undo method."""
         caretaker = CalculatorCaretaker()
         assert caretaker.can_undo() is False
         
-        memento = CalculatorMemento([Calculation("add", 5, 3, 8)])
+        memento = CalculatorMemento([sample_calcs[0]])
         caretaker.save_state(memento)
         assert caretaker.can_undo() is True
     
-    def test_can_redo(self):
+    def test_can_redo(self, sample_calcs):
         """Test can_redo method."""
         caretaker = CalculatorCaretaker()
         assert caretaker.can_redo() is False
         
-        memento = CalculatorMemento([Calculation("add", 5, 3, 8)])
+        memento = CalculatorMemento([sample_calcs[0]])
         caretaker.save_state(memento)
         caretaker.undo()
         
         assert caretaker.can_redo() is True
     
-    def test_clear(self):
+    def test_clear(self, sample_calcs):
         """Test clearing undo/redo stacks."""
         caretaker = CalculatorCaretaker()
         
-        memento1 = CalculatorMemento([Calculation("add", 5, 3, 8)])
+        memento1 = CalculatorMemento([sample_calcs[0]])
         caretaker.save_state(memento1)
         caretaker.undo()
         
@@ -185,9 +243,10 @@ class TestCalculatorCaretaker:
         """Test multiple undo and redo operations."""
         caretaker = CalculatorCaretaker()
         
-        # Save multiple states
+        # Save multiple states, each one calculation longer than the last
+        calcs = []
         for i in range(5):
-            calcs = [Calculation("add", i, i, i*2) for _ in range(i+1)]
+            calcs.append(Calculation("add", i, i, i*2))
             memento = CalculatorMemento(calcs)
             caretaker.save_state(memento)
         
@@ -200,3 +259,19 @@ class TestCalculatorCaretaker:
         # Redo
         state = caretaker.redo()
         assert len(state.get_history()) == 3
+    
+    def test_multiple_undo_redo_bounded(self):
+        """Test a long run of saves keeps only max_size undo states."""
+        caretaker = CalculatorCaretaker(max_size=50)
+        assert isinstance(caretaker._undo_stack, deque)
+        assert caretaker._undo_stack.maxlen == 50
+        
+        for i in range(200):
+            caretaker.save_state(CalculatorMemento([Calculation("add", i, i, i*2)]))
+        assert len(caretaker._undo_stack) == 50
+        
+        # The newest states survive eviction
+        state = caretaker.undo()
+        assert state.get_history()[0].operand1 == 198
+        state = caretaker.redo()
+        assert state.get_history()[0].operand1 == 199
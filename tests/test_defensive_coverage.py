@@ -1,8 +1,7 @@
 """Tests to cover defensive error handling paths."""
 
 import pytest
-import sys
-from unittest.mock import patch, MagicMock
+from app import operations
 from app.operations import RootOperation
 from app.exceptions import OperationError
 
@@ -10,69 +9,24 @@ from app.exceptions import OperationError
 class TestDefensiveErrorPaths:
     """Test defensive error handling that's hard to trigger normally."""
     
-    def test_root_operation_nan_result(self):
+    def test_root_operation_nan_result(self, monkeypatch):
         """Test root operation NaN check by injecting NaN into the calculation."""
         root_op = RootOperation()
         
-        # Patch the power operation within execute to return NaN
-        with patch.object(RootOperation, 'execute') as mock_execute:
-            # Make the mock call the real method but intercept at the right point
-            def side_effect(a, b):
-                # Bypass early validation
-                if b == 0:
-                    raise OperationError("Root degree cannot be zero")
-                if a < 0 and b % 2 == 0:
-                    raise OperationError("Cannot calculate even root of negative number")
-                
-                # Return NaN directly to trigger the check on line 124
-                import math
-                result = math.nan
-                
-                # This should trigger the NaN check
-                if not isinstance(result, (int, float)) or result != result:
-                    raise OperationError("Invalid result from root operation")
-                
-                return result
-            
-            mock_execute.side_effect = side_effect
-            
-            with pytest.raises(OperationError) as exc_info:
-                root_op.execute(100.0, 2.0)
-            
-            assert "Invalid result" in str(exc_info.value)
+        # Square roots go through math.sqrt; make it return NaN so the real
+        # NaN check in the root kernel runs
+        monkeypatch.setattr(operations.math, 'sqrt', lambda value: float('nan'))
+        
+        with pytest.raises(OperationError, match="Invalid result"):
+            root_op.execute(100.0, 2.0)
     
-    def test_root_operation_exception_during_calculation(self):
+    def test_root_operation_exception_during_calculation(self, monkeypatch):
         """Test root operation exception handler for unexpected errors."""
+        def failing_sqrt(value):
+            raise ValueError("Simulated calculation error")
         
-        # Create a subclass to inject an error
-        class ErrorProneRootOperation(RootOperation):
-            def execute(self, a: float, b: float) -> float:
-                if b == 0:
-                    raise OperationError("Root degree cannot be zero")
-                
-                if a < 0 and b % 2 == 0:
-                    raise OperationError("Cannot calculate even root of negative number")
-                
-                try:
-                    # Force a ValueError to trigger the exception handler
-                    if a == 999:
-                        raise ValueError("Simulated calculation error")
-                    
-                    if a < 0:
-                        result = -(abs(a) ** (1 / b))
-                    else:
-                        result = a ** (1 / b)
-                    
-                    if not isinstance(result, (int, float)) or result != result:
-                        raise OperationError("Invalid result from root operation")
-                    
-                    return result
-                except (ValueError, OverflowError, ZeroDivisionError) as e:
-                    raise OperationError(f"Root operation failed: {e}")
-        
-        error_op = ErrorProneRootOperation()
-        
-        with pytest.raises(OperationError) as exc_info:
-            error_op.execute(999.0, 2.0)
+        # Force a ValueError inside the real kernel to trigger its handler
+        monkeypatch.setattr(operations.math, 'sqrt', failing_sqrt)
         
-        assert "Root operation failed" in str(exc_info.value)
+        with pytest.raises(OperationError, match="Root operation failed: Simulated"):
+            RootOperation().execute(999.0, 2.0)
@@ -1,14 +1,24 @@
 """Unit tests for history management."""
 
 import pytest
-import os
-import tempfile
-import pandas as pd
-from app.history import CalculationHistory
+import csv
+from datetime import datetime
+from app.history import CalculationHistory, HistorySnapshot
 from app.calculation import Calculation
 from app.exceptions import HistoryError
 
 
+@pytest.fixture(scope="session")
+def sample_history_csv(tmp_path_factory):
+    """Save a two-entry history once; load tests only read the file."""
+    file_path = tmp_path_factory.mktemp("hist") / "history.csv"
+    history = CalculationHistory()
+    history.add_calculation(Calculation("add", 5, 3, 8))
+    history.add_calculation(Calculation("multiply", 4, 2, 8))
+    history.save_to_csv(str(file_path))
+    return str(file_path)
+
+
 class TestCalculationHistory:
     """Tests for CalculationHistory class."""
     
@@ -26,23 +36,15 @@ class TestCalculationHistory:
         assert len(history) == 1
         assert history.get_history()[0] == calc
     
-    def test_add_multiple_calculations(self):
+    def test_add_multiple_calculations(self, two_calc_history):
         """Test adding multiple calculations."""
-        history = CalculationHistory()
-        calc1 = Calculation("add", 5, 3, 8)
-        calc2 = Calculation("subtract", 10, 2, 8)
-        
-        history.add_calculation(calc1)
-        history.add_calculation(calc2)
-        
-        assert len(history) == 2
+        assert len(two_calc_history) == 2
     
-    def test_max_size_limit(self):
+    def test_max_size_limit(self, make_calcs):
         """Test history respects max size limit."""
         history = CalculationHistory(max_size=3)
         
-        for i in range(5):
-            calc = Calculation("add", i, i, i*2)
+        for calc in make_calcs(5):
             history.add_calculation(calc)
         
         assert len(history) == 3
@@ -62,131 +64,182 @@ class TestCalculationHistory:
         history_list.clear()
         assert len(history) == 1
     
-    def test_clear_history(self):
+    def test_clear_history(self, two_calc_history):
         """Test clearing history."""
-        history = CalculationHistory()
-        history.add_calculation(Calculation("add", 5, 3, 8))
-        history.add_calculation(Calculation("subtract", 10, 2, 8))
-        
-        history.clear_history()
-        assert len(history) == 0
+        two_calc_history.clear_history()
+        assert len(two_calc_history) == 0
     
-    def test_get_last_calculation(self):
+    def test_get_last_calculation(self, two_calc_history, sample_calcs):
         """Test getting last calculation."""
-        history = CalculationHistory()
-        calc1 = Calculation("add", 5, 3, 8)
-        calc2 = Calculation("subtract", 10, 2, 8)
-        
-        history.add_calculation(calc1)
-        history.add_calculation(calc2)
-        
-        last = history.get_last_calculation()
-        assert last == calc2
+        last = two_calc_history.get_last_calculation()
+        assert last == sample_calcs[1]
     
-    def test_get_last_calculation_empty_history(self):
+    def test_get_last_calculation_empty_history(self, empty_history):
         """Test getting last calculation from empty history raises error."""
-        history = CalculationHistory()
-        
         with pytest.raises(HistoryError, match="History is empty"):
-            history.get_last_calculation()
+            empty_history.get_last_calculation()
     
-    def test_remove_last_calculation(self):
+    def test_remove_last_calculation(self, two_calc_history, sample_calcs):
         """Test removing last calculation."""
-        history = CalculationHistory()
-        calc1 = Calculation("add", 5, 3, 8)
-        calc2 = Calculation("subtract", 10, 2, 8)
-        
-        history.add_calculation(calc1)
-        history.add_calculation(calc2)
-        
-        history.remove_last_calculation()
-        assert len(history) == 1
-        assert history.get_last_calculation() == calc1
+        two_calc_history.remove_last_calculation()
+        assert len(two_calc_history) == 1
+        assert two_calc_history.get_last_calculation() == sample_calcs[0]
     
-    def test_remove_last_calculation_empty_history(self):
+    def test_remove_last_calculation_empty_history(self, empty_history):
         """Test removing from empty history raises error."""
-        history = CalculationHistory()
-        
         with pytest.raises(HistoryError, match="History is empty"):
-            history.remove_last_calculation()
+            empty_history.remove_last_calculation()
     
-    def test_set_history(self):
+    def test_set_history(self, empty_history, sample_calcs):
         """Test setting entire history."""
-        history = CalculationHistory()
-        calc1 = Calculation("add", 5, 3, 8)
-        calc2 = Calculation("subtract", 10, 2, 8)
+        empty_history.set_history(sample_calcs)
         
-        new_history = [calc1, calc2]
-        history.set_history(new_history)
-        
-        assert len(history) == 2
+        assert empty_history.get_history() == list(sample_calcs)
     
-    def test_set_history_with_trim(self):
+    def test_set_history_with_trim(self, make_calcs):
         """Test setting history that exceeds max size."""
         history = CalculationHistory(max_size=2)
-        calcs = [
-            Calculation("add", i, i, i*2)
-            for i in range(5)
-        ]
+        calcs = make_calcs(5)
         
         history.set_history(calcs)
         assert len(history) == 2
     
-    def test_save_to_csv(self):
+    def test_set_history_from_iterator(self, make_calcs):
+        """Test setting history from a one-shot iterator keeps the latest entries."""
+        history = CalculationHistory(max_size=2)
+        calcs = make_calcs(5)
+        
+        history.set_history(iter(calcs))
+        assert history.get_history() == calcs[-2:]
+    
+    def test_save_to_csv(self, two_calc_history, tmp_path):
         """Test saving history to CSV."""
+        file_path = tmp_path / 'history.csv'
+        two_calc_history.save_to_csv(str(file_path))
+        
+        assert file_path.exists()
+        
+        # Verify CSV contents
+        with open(file_path, newline='') as f:
+            rows = list(csv.DictReader(f))
+        assert len(rows) == 2
+        assert 'operation' in rows[0]
+        assert 'operand1' in rows[0]
+        assert 'result' in rows[0]
+    
+    @pytest.mark.parametrize("n", [10, 1000, 10000])
+    def test_save_large_history_round_trip(self, n, tmp_path, make_calcs):
+        """Test large histories are written completely and load back intact."""
+        calcs = make_calcs(n)
+        history = CalculationHistory(max_size=n)
+        history.set_history(calcs)
+        
+        file_path = tmp_path / 'history.csv'
+        history.save_to_csv(str(file_path))
+        
+        loaded = CalculationHistory(max_size=n)
+        loaded.load_from_csv(str(file_path))
+        assert loaded.get_history() == calcs
+    
+    def test_save_to_csv_row_format(self, tmp_path):
+        """Test saved rows follow the header column order."""
         history = CalculationHistory()
-        calc1 = Calculation("add", 5, 3, 8)
-        calc2 = Calculation("subtract", 10, 2, 8)
+        calc = Calculation("add", 5.0, 3.0, 8.0)
+        history.add_calculation(calc)
         
-        history.add_calculation(calc1)
-        history.add_calculation(calc2)
+        file_path = tmp_path / 'history.csv'
+        history.save_to_csv(str(file_path))
+        
+        lines = file_path.read_text().splitlines()
+        assert lines == [
+            "operation,operand1,operand2,result,timestamp",
+            f"add,5.0,3.0,8.0,{calc.timestamp.isoformat()}",
+        ]
+    
+    @pytest.mark.parametrize("operation", ["bad,name", 'bad"name', "bad\nname"])
+    def test_save_operation_needing_quotes(self, tmp_path, operation):
+        """Test an operation name with CSV special characters round-trips."""
+        history = CalculationHistory()
+        calc = Calculation(operation, 5, 3, 8, datetime(2025, 11, 2, 10, 30))
+        history.add_calculation(calc)
         
-        with tempfile.TemporaryDirectory() as tmpdir:
-            file_path = os.path.join(tmpdir, 'history.csv')
-            history.save_to_csv(file_path)
-            
-            assert os.path.exists(file_path)
-            
-            # Verify CSV contents
-            df = pd.read_csv(file_path)
-            assert len(df) == 2
-            assert 'operation' in df.columns
-            assert 'operand1' in df.columns
-            assert 'result' in df.columns
-    
-    def test_save_empty_history_to_csv(self):
+        file_path = tmp_path / 'history.csv'
+        history.save_to_csv(str(file_path))
+        
+        loaded = CalculationHistory()
+        loaded.load_from_csv(str(file_path))
+        assert loaded.get_history() == [calc]
+    
+    def test_save_empty_history_to_csv(self, tmp_path):
         """Test saving empty history to CSV."""
         history = CalculationHistory()
         
-        with tempfile.TemporaryDirectory() as tmpdir:
-            file_path = os.path.join(tmpdir, 'history.csv')
-            history.save_to_csv(file_path)
-            
-            assert os.path.exists(file_path)
-            df = pd.read_csv(file_path)
-            assert len(df) == 0
+        file_path = tmp_path / 'history.csv'
+        history.save_to_csv(str(file_path))
+        
+        # Only the header row is written
+        assert file_path.read_text().splitlines() == [
+            "operation,operand1,operand2,result,timestamp"
+        ]
     
-    def test_load_from_csv(self):
+    def test_load_from_csv(self, sample_history_csv):
         """Test loading history from CSV."""
+        new_history = CalculationHistory()
+        new_history.load_from_csv(sample_history_csv)
+        
+        assert len(new_history) == 2
+        loaded = new_history.get_history()
+        assert loaded[0].operation == "add"
+        assert loaded[1].operation == "multiply"
+        assert (loaded[1].operand1, loaded[1].operand2, loaded[1].result) == (4.0, 2.0, 8.0)
+    
+    def test_load_from_csv_column_types(self, sample_history_csv):
+        """Test loaded columns get fixed types rather than inferred ones."""
+        new_history = CalculationHistory()
+        new_history.load_from_csv(sample_history_csv)
+        
+        for calc in new_history.get_history():
+            assert type(calc.operation) is str
+            assert type(calc.operand1) is float
+            assert type(calc.operand2) is float
+            assert type(calc.result) is float
+            assert type(calc.timestamp) is datetime
+    
+    def test_load_from_csv_trims_to_max_size(self, sample_history_csv):
+        """Test loading keeps only the newest max_size entries."""
+        new_history = CalculationHistory(max_size=1)
+        new_history.load_from_csv(sample_history_csv)
+        
+        assert [calc.operation for calc in new_history.get_history()] == ["multiply"]
+    
+    def test_load_from_csv_with_reordered_columns(self, tmp_path):
+        """Test loading uses the header to locate columns."""
+        file_path = tmp_path / 'history.csv'
+        file_path.write_text(
+            'result,operation,operand2,operand1\n'
+            '8,add,3,5\n'
+        )
+        
         history = CalculationHistory()
-        calc1 = Calculation("add", 5, 3, 8)
-        calc2 = Calculation("multiply", 4, 2, 8)
+        history.load_from_csv(str(file_path))
         
-        history.add_calculation(calc1)
-        history.add_calculation(calc2)
+        calc = history.get_last_calculation()
+        assert calc.operation == "add"
+        assert (calc.operand1, calc.operand2, calc.result) == (5.0, 3.0, 8.0)
+    
+    def test_load_from_csv_parses_only_kept_rows(self, tmp_path):
+        """Test rows trimmed by max_size are never converted."""
+        file_path = tmp_path / 'history.csv'
+        file_path.write_text(
+            'operation,operand1,operand2,result\n'
+            'add,not-a-number,1,2\n'
+            + ''.join(f'add,{n},{n},{n + n}\n' for n in range(1000))
+        )
         
-        with tempfile.TemporaryDirectory() as tmpdir:
-            file_path = os.path.join(tmpdir, 'history.csv')
-            history.save_to_csv(file_path)
-            
-            # Load into new history
-            new_history = CalculationHistory()
-            new_history.load_from_csv(file_path)
-            
-            assert len(new_history) == 2
-            loaded = new_history.get_history()
-            assert loaded[0].operation == "add"
-            assert loaded[1].operation == "multiply"
+        history = CalculationHistory(max_size=3)
+        history.load_from_csv(str(file_path))
+        
+        assert [calc.operand1 for calc in history.get_history()] == [997.0, 998.0, 999.0]
     
     def test_load_from_nonexistent_file(self):
         """Test loading from non-existent file raises error."""
@@ -195,23 +248,37 @@ class TestCalculationHistory:
         with pytest.raises(HistoryError, match="History file not found"):
             history.load_from_csv("nonexistent.csv")
     
-    def test_load_from_empty_csv(self):
+    def test_load_csv_skips_blank_lines(self, tmp_path):
+        """Test blank and trailing lines neither fail nor take history slots."""
+        file_path = tmp_path / 'blank_lines.csv'
+        file_path.write_text(
+            "\n"
+            "operation,operand1,operand2,result,timestamp\n"
+            "add,1.0,1.0,2.0,2025-11-02T10:30:00\n"
+            "\n"
+            "add,2.0,2.0,4.0,2025-11-02T10:31:00\n"
+            "\n"
+            "\n"
+        )
+        history = CalculationHistory(max_size=2)
+        
+        history.load_from_csv(str(file_path))
+        assert [calc.result for calc in history.get_history()] == [2.0, 4.0]
+    
+    def test_load_from_empty_csv(self, tmp_path):
         """Test loading from empty CSV file."""
         history = CalculationHistory()
         
-        with tempfile.TemporaryDirectory() as tmpdir:
-            file_path = os.path.join(tmpdir, 'empty.csv')
-            # Create empty CSV
-            with open(file_path, 'w') as f:
-                f.write('')
-            
-            history.load_from_csv(file_path)
-            assert len(history) == 0
+        # Create empty CSV
+        file_path = tmp_path / 'empty.csv'
+        file_path.write_text('')
+        
+        history.load_from_csv(str(file_path))
+        assert len(history) == 0
     
-    def test_str_representation_empty(self):
+    def test_str_representation_empty(self, empty_history):
         """Test string representation of empty history."""
-        history = CalculationHistory()
-        assert "No calculations" in str(history)
+        assert "No calculations" in str(empty_history)
     
     def test_str_representation_with_calculations(self):
         """Test string representation with calculations."""
@@ -221,3 +288,90 @@ class TestCalculationHistory:
         string_repr = str(history)
         assert "Calculation History" in string_repr
         assert "1." in string_repr
+    
+    def test_snapshot(self):
+        """Test snapshot is unaffected by later history changes."""
+        history = CalculationHistory()
+        calc = Calculation("add", 5, 3, 8)
+        history.add_calculation(calc)
+        
+        snapshot = history.snapshot()
+        assert snapshot.to_list() == [calc]
+        
+        # Later changes shouldn't affect the snapshot
+        history.add_calculation(Calculation("subtract", 10, 2, 8))
+        history.clear_history()
+        assert snapshot.to_list() == [calc]
+    
+    def test_restore_snapshot(self):
+        """Test restoring a snapshot replaces the history."""
+        history = CalculationHistory()
+        calc1 = Calculation("add", 5, 3, 8)
+        calc2 = Calculation("subtract", 10, 2, 8)
+        history.add_calculation(calc1)
+        snapshot = history.snapshot()
+        history.add_calculation(calc2)
+        
+        history.restore(snapshot)
+        assert history.get_history() == [calc1]
+        
+        # The restored history can grow independently of the snapshot
+        history.add_calculation(calc2)
+        assert history.get_history() == [calc1, calc2]
+        assert snapshot.to_list() == [calc1]
+    
+    def test_restore_snapshot_exceeding_max_size(self, make_calcs):
+        """Test restoring a snapshot larger than max size trims it."""
+        calcs = make_calcs(5)
+        snapshot = HistorySnapshot.from_calculations(calcs)
+        
+        history = CalculationHistory(max_size=2)
+        history.restore(snapshot)
+        assert history.get_history() == calcs[-2:]
+    
+    def test_chain_bounded_across_restores(self, make_calcs):
+        """Test restoring snapshots while adding keeps the chain bounded."""
+        history = CalculationHistory(max_size=10)
+        calcs = make_calcs(20)
+        for calc in calcs:
+            history.add_calculation(calc)
+        
+        # Undo and redo restore snapshots taken between additions
+        for calc in calcs * 20:
+            history.add_calculation(calc)
+            snapshot = history.snapshot()
+            history.add_calculation(calc)
+            history.restore(snapshot)
+        
+        nodes = 0
+        node = history._head
+        while node is not None:
+            nodes += 1
+            node = node.prev
+        assert len(history) == 10
+        assert nodes < 2 * 10
+    
+    def test_max_size_limit_after_many_additions(self, make_calcs):
+        """Test history keeps the most recent calculations across relinks."""
+        history = CalculationHistory(max_size=3)
+        calcs = make_calcs(20)
+        
+        for calc in calcs:
+            history.add_calculation(calc)
+        
+        assert len(history) == 3
+        assert history.get_history() == calcs[-3:]
+        assert history._depth < 2 * 3
+    
+    def test_remove_then_add_after_trim(self, make_calcs):
+        """Test removing and adding behave like a trimmed list."""
+        history = CalculationHistory(max_size=2)
+        calcs = make_calcs(4)
+        for calc in calcs[:3]:
+            history.add_calculation(calc)
+        
+        history.remove_last_calculation()
+        assert history.get_history() == [calcs[1]]
+        
+        history.add_calculation(calcs[3])
+        assert history.get_history() == [calcs[1], calcs[3]]
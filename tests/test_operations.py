@@ -2,6 +2,7 @@
 
 import pytest
 from app.operations import (
+    Operation,
     AddOperation,
     SubtractOperation,
     MultiplyOperation,
@@ -17,258 +18,171 @@ from app.operations import (
 from app.exceptions import OperationError
 
 
-class TestAddOperation:
-    """Tests for AddOperation."""
-    
-    def test_add_positive_numbers(self):
-        """Test adding two positive numbers."""
-        op = AddOperation()
-        assert op.execute(5, 3) == 8
-        assert op.get_name() == "add"
-    
-    def test_add_negative_numbers(self):
-        """Test adding negative numbers."""
-        op = AddOperation()
-        assert op.execute(-5, -3) == -8
-        assert op.execute(-5, 3) == -2
-    
-    def test_add_zero(self):
-        """Test adding zero."""
-        op = AddOperation()
-        assert op.execute(5, 0) == 5
-        assert op.execute(0, 0) == 0
-
-
-class TestSubtractOperation:
-    """Tests for SubtractOperation."""
-    
-    def test_subtract_positive_numbers(self):
-        """Test subtracting positive numbers."""
-        op = SubtractOperation()
-        assert op.execute(10, 3) == 7
-        assert op.get_name() == "subtract"
-    
-    def test_subtract_negative_result(self):
-        """Test subtraction resulting in negative."""
-        op = SubtractOperation()
-        assert op.execute(3, 10) == -7
-
-
-class TestMultiplyOperation:
-    """Tests for MultiplyOperation."""
-    
-    def test_multiply_positive_numbers(self):
-        """Test multiplying positive numbers."""
-        op = MultiplyOperation()
-        assert op.execute(5, 3) == 15
-        assert op.get_name() == "multiply"
-    
-    def test_multiply_by_zero(self):
-        """Test multiplying by zero."""
-        op = MultiplyOperation()
-        assert op.execute(5, 0) == 0
-    
-    def test_multiply_negative_numbers(self):
-        """Test multiplying negative numbers."""
-        op = MultiplyOperation()
-        assert op.execute(-5, 3) == -15
-        assert op.execute(-5, -3) == 15
-
-
-class TestDivideOperation:
-    """Tests for DivideOperation."""
-    
-    def test_divide_positive_numbers(self):
-        """Test dividing positive numbers."""
-        op = DivideOperation()
-        assert op.execute(10, 2) == 5
-        assert op.get_name() == "divide"
-    
-    def test_divide_by_zero(self):
-        """Test division by zero raises error."""
-        op = DivideOperation()
-        with pytest.raises(OperationError, match="Division by zero"):
-            op.execute(10, 0)
-    
-    def test_divide_negative_numbers(self):
-        """Test dividing negative numbers."""
-        op = DivideOperation()
-        assert op.execute(-10, 2) == -5
-        assert op.execute(10, -2) == -5
-
-
-class TestPowerOperation:
-    """Tests for PowerOperation."""
-    
-    def test_power_positive_exponent(self):
-        """Test power with positive exponent."""
-        op = PowerOperation()
-        assert op.execute(2, 3) == 8
-        assert op.get_name() == "power"
-    
-    def test_power_zero_exponent(self):
-        """Test power with zero exponent."""
-        op = PowerOperation()
-        assert op.execute(5, 0) == 1
-    
-    def test_power_negative_exponent(self):
-        """Test power with negative exponent."""
-        op = PowerOperation()
-        assert op.execute(2, -2) == 0.25
-    
-    def test_power_fractional_exponent(self):
-        """Test power with fractional exponent."""
-        op = PowerOperation()
-        assert op.execute(4, 0.5) == 2
-
-
-class TestRootOperation:
-    """Tests for RootOperation."""
-    
-    def test_square_root(self):
-        """Test square root."""
-        op = RootOperation()
-        assert op.execute(9, 2) == 3
-        assert op.get_name() == "root"
-    
-    def test_cube_root(self):
-        """Test cube root."""
-        op = RootOperation()
-        result = op.execute(8, 3)
-        assert abs(result - 2) < 0.01
-    
-    def test_root_zero_degree(self):
-        """Test root with zero degree raises error."""
-        op = RootOperation()
-        with pytest.raises(OperationError, match="Root degree cannot be zero"):
-            op.execute(9, 0)
-    
-    def test_even_root_negative_number(self):
-        """Test even root of negative number raises error."""
-        op = RootOperation()
-        with pytest.raises(OperationError, match="Cannot calculate even root"):
-            op.execute(-9, 2)
-    
-    def test_odd_root_negative_number(self):
-        """Test odd root of negative number."""
-        op = RootOperation()
-        result = op.execute(-8, 3)
-        assert abs(result - (-2)) < 0.01
-
-
-class TestModulusOperation:
-    """Tests for ModulusOperation."""
-    
-    def test_modulus_positive_numbers(self):
-        """Test modulus with positive numbers."""
-        op = ModulusOperation()
-        assert op.execute(10, 3) == 1
-        assert op.get_name() == "modulus"
-    
-    def test_modulus_by_zero(self):
-        """Test modulus by zero raises error."""
-        op = ModulusOperation()
-        with pytest.raises(OperationError, match="Modulus by zero"):
-            op.execute(10, 0)
-    
-    def test_modulus_negative_numbers(self):
-        """Test modulus with negative numbers."""
-        op = ModulusOperation()
-        assert op.execute(-10, 3) == 2
-
-
-class TestIntegerDivideOperation:
-    """Tests for IntegerDivideOperation."""
-    
-    def test_integer_divide_positive_numbers(self):
-        """Test integer division with positive numbers."""
-        op = IntegerDivideOperation()
-        assert op.execute(10, 3) == 3
-        assert op.get_name() == "int_divide"
-    
-    def test_integer_divide_by_zero(self):
-        """Test integer division by zero raises error."""
-        op = IntegerDivideOperation()
-        with pytest.raises(OperationError, match="Division by zero"):
-            op.execute(10, 0)
-    
-    def test_integer_divide_negative_numbers(self):
-        """Test integer division with negative numbers."""
-        op = IntegerDivideOperation()
-        assert op.execute(-10, 3) == -4
-
-
-class TestPercentageOperation:
-    """Tests for PercentageOperation."""
-    
-    def test_percentage_calculation(self):
-        """Test percentage calculation."""
-        op = PercentageOperation()
-        assert op.execute(50, 200) == 25
-        assert op.get_name() == "percent"
-    
-    def test_percentage_zero_denominator(self):
-        """Test percentage with zero denominator raises error."""
-        op = PercentageOperation()
-        with pytest.raises(OperationError, match="Cannot calculate percentage"):
-            op.execute(50, 0)
-    
-    def test_percentage_over_100(self):
-        """Test percentage over 100."""
-        op = PercentageOperation()
-        assert op.execute(300, 200) == 150
-
-
-class TestAbsoluteDifferenceOperation:
-    """Tests for AbsoluteDifferenceOperation."""
-    
-    def test_absolute_difference_positive_result(self):
-        """Test absolute difference with positive result."""
-        op = AbsoluteDifferenceOperation()
-        assert op.execute(10, 3) == 7
-        assert op.get_name() == "abs_diff"
-    
-    def test_absolute_difference_negative_inputs(self):
-        """Test absolute difference always returns positive."""
-        op = AbsoluteDifferenceOperation()
-        assert op.execute(3, 10) == 7
-        assert op.execute(-5, -3) == 2
+# (operation, a, b, expected result)
+OPERATION_CASES = [
+    ("add", 5, 3, 8),
+    ("add", -5, -3, -8),
+    ("add", -5, 3, -2),
+    ("add", 5, 0, 5),
+    ("add", 0, 0, 0),
+    ("subtract", 10, 3, 7),
+    ("subtract", 3, 10, -7),
+    ("multiply", 5, 3, 15),
+    ("multiply", 5, 0, 0),
+    ("multiply", -5, 3, -15),
+    ("multiply", -5, -3, 15),
+    ("divide", 10, 2, 5),
+    ("divide", -10, 2, -5),
+    ("divide", 10, -2, -5),
+    ("power", 2, 3, 8),
+    ("power", 5, 0, 1),
+    ("power", 2, -2, 0.25),
+    ("power", 4, 0.5, 2),
+    # Square roots of perfect squares are exact
+    ("root", 9, 2, 3),
+    ("root", 1e10, 2, 1e5),
+    ("root", 0, 2, 0),
+    ("root", 2.25, 2.0, 1.5),
+    ("root", 8, 3, pytest.approx(2, abs=0.01)),
+    ("root", -8, 3, pytest.approx(-2, abs=0.01)),
+    # The result takes the sign of the divisor
+    ("modulus", 10, 3, 1),
+    ("modulus", -10, 3, 2),
+    ("modulus", 10, -3, -2),
+    ("int_divide", 10, 3, 3),
+    ("int_divide", -10, 3, -4),
+    ("percent", 50, 200, 25),
+    ("percent", 300, 200, 150),
+    ("abs_diff", 10, 3, 7),
+    ("abs_diff", 3, 10, 7),
+    ("abs_diff", -5, -3, 2),
+]
+
+# (operation, a, b, expected error message pattern)
+OPERATION_ERROR_CASES = [
+    ("divide", 10, 0, "Division by zero"),
+    ("divide", 10, -0.0, "Division by zero"),
+    ("root", 9, 0, "Root degree cannot be zero"),
+    ("root", -9, 2, "Cannot calculate even root"),
+    ("modulus", 10, 0, "Modulus by zero"),
+    ("int_divide", 10, 0, "Division by zero"),
+    ("percent", 50, 0, "Cannot calculate percentage"),
+]
+
+
+class TestOperationExecute:
+    """Tests for executing each operation."""
+    
+    @pytest.mark.parametrize("name,a,b,expected", OPERATION_CASES)
+    def test_execute(self, name, a, b, expected):
+        """Test an operation returns the expected result."""
+        op = OperationFactory.create_operation(name)
+        assert op.execute(a, b) == expected
+    
+    @pytest.mark.parametrize("name,a,b,match", OPERATION_ERROR_CASES)
+    def test_execute_error(self, name, a, b, match):
+        """Test an operation rejects invalid operands."""
+        op = OperationFactory.create_operation(name)
+        with pytest.raises(OperationError, match=match):
+            op.execute(a, b)
+
+
+# (operation name, operation class) for every built-in operation
+BUILTIN_OPERATIONS = [
+    ("add", AddOperation),
+    ("subtract", SubtractOperation),
+    ("multiply", MultiplyOperation),
+    ("divide", DivideOperation),
+    ("power", PowerOperation),
+    ("root", RootOperation),
+    ("modulus", ModulusOperation),
+    ("int_divide", IntegerDivideOperation),
+    ("percent", PercentageOperation),
+    ("abs_diff", AbsoluteDifferenceOperation),
+]
+
+
+@pytest.fixture(scope="session")
+def available_operations():
+    """Available operation names, fetched once for the session."""
+    return OperationFactory.get_available_operations()
+
+
+@pytest.fixture
+def factory_cleanup():
+    """Restore the factory registry after a test that registers operations."""
+    registry = dict(OperationFactory._registry)
+    instances = dict(OperationFactory._instances)
+    yield
+    # Restore in place: _operations is a live view of _registry
+    OperationFactory._registry.clear()
+    OperationFactory._registry.update(registry)
+    OperationFactory._instances.clear()
+    OperationFactory._instances.update(instances)
+    OperationFactory._invalidate_caches()
 
 
 class TestOperationFactory:
     """Tests for OperationFactory."""
     
-    @pytest.mark.parametrize("operation_name,expected_class", [
-        ("add", AddOperation),
-        ("subtract", SubtractOperation),
-        ("multiply", MultiplyOperation),
-        ("divide", DivideOperation),
-        ("power", PowerOperation),
-        ("root", RootOperation),
-        ("modulus", ModulusOperation),
-        ("int_divide", IntegerDivideOperation),
-        ("percent", PercentageOperation),
-        ("abs_diff", AbsoluteDifferenceOperation),
-    ])
+    @pytest.mark.parametrize("operation_name,expected_class", BUILTIN_OPERATIONS)
     def test_create_operation(self, operation_name, expected_class):
         """Test creating operations using factory."""
         op = OperationFactory.create_operation(operation_name)
         assert isinstance(op, expected_class)
     
+    @pytest.mark.parametrize("operation_name,operation_class", BUILTIN_OPERATIONS)
+    def test_get_name(self, operation_name, operation_class):
+        """Test each operation reports the name it is registered under."""
+        assert operation_class().get_name() == operation_name
+    
+    @pytest.mark.parametrize("operation_name", OperationFactory.get_available_operations())
+    def test_operations_have_no_instance_dict(self, operation_name):
+        """Test built-in operations use empty __slots__."""
+        op = OperationFactory.create_operation(operation_name)
+        assert not hasattr(op, '__dict__')
+    
     def test_create_unknown_operation(self):
         """Test creating unknown operation raises error."""
         with pytest.raises(OperationError, match="Unknown operation"):
             OperationFactory.create_operation("unknown")
     
-    def test_get_available_operations(self):
-        """Test getting list of available operations."""
+    def test_get_available_operations(self, available_operations):
+        """Test the available operations are exactly the built-in ones."""
+        assert len(available_operations) == len(BUILTIN_OPERATIONS)
+    
+    @pytest.mark.parametrize("operation_name", [name for name, _ in BUILTIN_OPERATIONS])
+    def test_available_operations_contains(self, available_operations, operation_name):
+        """Test each built-in operation is listed as available."""
+        assert operation_name in available_operations
+    
+    def test_create_operation_reuses_instance(self):
+        """Test repeated lookups return the cached operation instance."""
+        op1 = OperationFactory.create_operation("add")
+        op2 = OperationFactory.create_operation("add")
+        assert op1 is op2
+    
+    def test_get_available_names_joined(self):
+        """Test the joined operation names match the available list."""
+        joined = OperationFactory.get_available_names_joined()
+        assert joined == ", ".join(OperationFactory.get_available_operations())
+    
+    def test_get_available_operations_returns_copy(self):
+        """Test modifying the returned list doesn't affect the factory."""
         operations = OperationFactory.get_available_operations()
-        assert len(operations) == 10
-        assert "add" in operations
-        assert "subtract" in operations
-        assert "multiply" in operations
+        operations.clear()
+        assert len(OperationFactory.get_available_operations()) == len(BUILTIN_OPERATIONS)
     
-    def test_register_operation(self):
+    def test_operation_subclass_must_implement_execute(self):
+        """Test an operation without execute cannot be instantiated."""
+        class IncompleteOperation(Operation):
+            def get_name(self):
+                return "incomplete"
+        
+        with pytest.raises(TypeError):
+            IncompleteOperation()
+    
+    def test_register_operation(self, factory_cleanup):
         """Test registering a new operation."""
         class CustomOperation(AddOperation):
             def get_name(self):
@@ -277,6 +191,31 @@ class TestOperationFactory:
         OperationFactory.register_operation("custom", CustomOperation)
         op = OperationFactory.create_operation("custom")
         assert isinstance(op, CustomOperation)
+        assert "custom" in OperationFactory.get_available_operations()
+        assert OperationFactory.get_available_names_joined().endswith("custom")
+    
+    def test_register_operation_replaces_cached_instance(self, factory_cleanup):
+        """Test re-registering a name stops returning the old instance."""
+        class LoudAddOperation(AddOperation):
+            pass
+        
+        original = OperationFactory.create_operation("add")
+        OperationFactory.register_operation("add", LoudAddOperation)
+        assert isinstance(OperationFactory.create_operation("add"), LoudAddOperation)
         
-        # Clean up
-        OperationFactory._operations.pop("custom", None)
+        OperationFactory.register_operation("add", AddOperation)
+        assert OperationFactory.create_operation("add") is not original
+        assert type(OperationFactory.create_operation("add")) is AddOperation
+    
+    def test_operations_view_is_read_only(self):
+        """Test the public registry view rejects direct writes."""
+        with pytest.raises(TypeError):
+            OperationFactory._operations["custom"] = AddOperation
+        assert "custom" not in OperationFactory.get_available_operations()
+    
+    @pytest.mark.parametrize("name", ["bad,name", 'bad"name', "bad\nname"])
+    def test_register_operation_invalid_name(self, name):
+        """Test registering a name that would break the history CSV."""
+        with pytest.raises(OperationError, match="Invalid operation name"):
+            OperationFactory.register_operation(name, AddOperation)
+        assert name not in OperationFactory.get_available_operations()